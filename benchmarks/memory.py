@@ -0,0 +1,75 @@
+"""
+Memory used per node by the slotted Node, compared with the layout Node
+had before it was slotted (an instance __dict__ with eager children,
+tags, content and debug_info containers).
+
+Node keeps a __dict__ slot, so subclasses declaring __slots__ for their
+own attributes still have it and gain next to nothing; they aren't
+measured.
+
+Usage: python -m benchmarks.memory [count]
+"""
+
+import gc
+import sys
+import tracemalloc
+
+import nodex
+
+class LegacyNode:
+    # Same per-instance state as the Node class before it was slotted
+    _id_counter = 0
+
+    def __init__(self, context, label="Node"):
+        self.context = context
+        self.label = label
+        self.update_ = True
+        self.children = []
+        self.tags = set({"@" + label})
+        self.parent = None
+        self.order = 0
+        self.id = LegacyNode._id_counter
+        LegacyNode._id_counter += 1
+        self.content = {}
+        self.debug_info = {}
+
+class LegacyParticle(LegacyNode):
+    def __init__(self, context):
+        super().__init__(context, "Particle")
+        self.x = 0.0
+        self.y = 0.0
+        self.vx = 0.0
+        self.vy = 0.0
+
+class Particle(nodex.Node):
+    def __init__(self, context):
+        super().__init__(context, "Particle")
+        self.x = 0.0
+        self.y = 0.0
+        self.vx = 0.0
+        self.vy = 0.0
+
+def measure(factory, count: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    nodes = [factory() for _ in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # The list holding the nodes is not part of their cost
+    return (after - before - sys.getsizeof(nodes)) / count
+
+def main(count: int = 100_000) -> None:
+    context = nodex.Context((1, 1), backend="headless")
+    cases = [
+        ("LegacyNode", lambda: LegacyNode(context)),
+        ("Node", lambda: nodex.Node(context)),
+        ("LegacyNode subclass (x, y, vx, vy)", lambda: LegacyParticle(context)),
+        ("Node subclass (x, y, vx, vy)", lambda: Particle(context)),
+    ]
+    print(f"{count} nodes per case")
+    for name, factory in cases:
+        print(f"{name:<40} {measure(factory, count):>8.1f} bytes/node")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
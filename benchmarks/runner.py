@@ -0,0 +1,215 @@
+"""
+Runs the benchmark scenarios for a fixed number of frames, across node
+counts and backends, and writes the results as JSON. Results can be
+compared with a baseline, regressions make the exit status 1.
+
+Frame times depend on the machine, so every run also times a fixed pure
+Python workload, the calibration. Baseline times are scaled by the ratio
+of the two calibrations before being compared, which takes most of the
+machine out of the comparison but not all of it: keep the threshold
+loose against a baseline recorded elsewhere, or record one locally first.
+
+Usage:
+    python -m benchmarks.runner [--scenarios a,b] [--counts 1000,10000] [--backends headless,pygame]
+                                [--frames 120] [--output results.json]
+                                [--baseline benchmarks/baseline.json] [--threshold 0.25] [--note text]
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+from typing import *
+
+BACKENDS = ("headless", "pygame", "sdl2", "pyglet")
+DEFAULT_COUNTS = (1000, 10000)
+DEFAULT_FRAMES = 120
+WARMUP_FRAMES = 5
+ALLOCATION_FRAMES = 5
+
+def configure_display() -> None:
+    # Window backends run without a display when none is available. Has to
+    # happen before nodex, and so pyglet.window, is imported
+    if not os.environ.get("DISPLAY") and not os.environ.get("WAYLAND_DISPLAY"):
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        import pyglet
+        pyglet.options["headless"] = True
+
+def make_context(backend: str):
+    import nodex
+    from benchmarks.scenarios import SIZE
+    # No frame rate limit, frames are never waited for
+    return nodex.Context(SIZE, backend=backend, fps_limit=0)
+
+def run_frame(context, frame: Callable[[], None]) -> None:
+    # The scenes move by a fixed step per frame, whatever the frame time
+    context.step(frame, dt=1)
+
+def calibrate(repeat: int = 5) -> float:
+    """Milliseconds the calibration workload takes, the best of repeat runs."""
+    clock = time.perf_counter
+    best = float("inf")
+    for _ in range(repeat):
+        start = clock()
+        values = {}
+        for index in range(200_000):
+            values[index & 1023] = values.get((index * 7) & 1023, 0) + index
+        best = min(best, clock() - start)
+    return best * 1000
+
+def measure(context, frame: Callable[[], None], frames: int) -> Dict[str, float]:
+    for _ in range(WARMUP_FRAMES):
+        run_frame(context, frame)
+
+    clock = time.perf_counter
+    times = []
+    gc.collect()
+    for _ in range(frames):
+        start = clock()
+        run_frame(context, frame)
+        times.append((clock() - start) * 1000)
+
+    # Allocations are traced in a few separate frames, tracing slows them down
+    gc.collect()
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    before = tracemalloc.get_traced_memory()[0]
+    for _ in range(ALLOCATION_FRAMES):
+        run_frame(context, frame)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    times.sort()
+    return {
+        "frames": frames,
+        "mean_ms": statistics.fmean(times),
+        "p50_ms": times[len(times) // 2],
+        "p99_ms": times[min(int(len(times) * 0.99), len(times) - 1)],
+        "min_ms": times[0],
+        "max_ms": times[-1],
+        "retained_bytes_per_frame": (current - before) / ALLOCATION_FRAMES,
+        "peak_alloc_bytes": peak - before,
+    }
+
+def run(scenarios: Iterable[str], counts: Iterable[int], backends: Iterable[str], frames: int,
+        note: str = "") -> Dict[str, Any]:
+    from benchmarks.scenarios import SCENARIOS
+
+    results = []
+    skipped = {}
+    for backend in backends:
+        try:
+            context = make_context(backend)
+        except Exception as error:
+            skipped[backend] = f"{error.__class__.__name__}: {error}"
+            print(f"{backend}: skipped ({skipped[backend]})", file=sys.stderr)
+            continue
+        for name in scenarios:
+            for count in counts:
+                # Scenarios may move the camera, each starts with the default one
+                context.camera.position = (0, 0)
+                context.camera.zoom = 1.0
+                frame = SCENARIOS[name](context, count)
+                result = {"scenario": name, "backend": backend, "count": count}
+                result.update(measure(context, frame, frames))
+                results.append(result)
+                print(f"{name:<16} {backend:<9} {count:>7} mean {result['mean_ms']:>9.3f} ms  "
+                      f"p50 {result['p50_ms']:>9.3f} ms  p99 {result['p99_ms']:>9.3f} ms", file=sys.stderr)
+                del frame
+                gc.collect()
+    return {
+        "meta": {
+            "note": note,
+            "calibration_ms": calibrate(),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "frames": frames,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "skipped": skipped,
+        "results": results,
+    }
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Returns a line per result whose mean or p99 frame time grew more than
+    threshold over the baseline, scaled to this machine by the calibrations.
+    """
+    def key(result):
+        return result["scenario"], result["backend"], result["count"]
+
+    scale = 1.0
+    calibration = results["meta"].get("calibration_ms")
+    base_calibration = baseline["meta"].get("calibration_ms")
+    if calibration and base_calibration:
+        scale = calibration / base_calibration
+    reference = {key(result): result for result in baseline["results"]}
+    regressions = []
+    for result in results["results"]:
+        base = reference.get(key(result))
+        if base is None:
+            continue
+        for metric in ("mean_ms", "p99_ms"):
+            expected = base[metric] * scale
+            if expected > 0 and result[metric] > expected * (1 + threshold):
+                regressions.append(
+                    f"{result['scenario']} {result['backend']} {result['count']}: {metric} "
+                    f"{expected:.3f} -> {result[metric]:.3f} ({result[metric] / expected - 1:+.0%})"
+                )
+    return regressions
+
+def main(argv: Optional[List[str]] = None) -> int:
+    configure_display()
+    from benchmarks.scenarios import SCENARIOS
+
+    parser = argparse.ArgumentParser(description="Nodex benchmark suite")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma separated scenario names")
+    parser.add_argument("--counts", default=",".join(map(str, DEFAULT_COUNTS)), help="comma separated node counts")
+    parser.add_argument("--backends", default="headless", help="comma separated backends, or all")
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES, help="measured frames per run")
+    parser.add_argument("--output", help="file the results are written to, standard output otherwise")
+    parser.add_argument("--baseline", help="results to compare with")
+    parser.add_argument("--threshold", type=float, default=0.25, help="slowdown counted as a regression")
+    parser.add_argument("--note", default="", help="description of the machine, kept with the results")
+    args = parser.parse_args(argv)
+
+    scenarios = args.scenarios.split(",")
+    unknown = [name for name in scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios {', '.join(unknown)}, known are {', '.join(SCENARIOS)}")
+    backends = BACKENDS if args.backends == "all" else args.backends.split(",")
+    counts = [int(count) for count in args.counts.split(",")]
+
+    results = run(scenarios, counts, backends, args.frames, args.note)
+    if args.output:
+        with open(args.output, "w") as stream:
+            json.dump(results, stream, indent=1)
+    else:
+        json.dump(results, sys.stdout, indent=1)
+        print()
+
+    if args.baseline:
+        with open(args.baseline) as stream:
+            baseline = json.load(stream)
+        base_meta = baseline["meta"]
+        if (base_meta.get("platform"), base_meta.get("python")) != (results["meta"]["platform"], results["meta"]["python"]):
+            print(f"baseline recorded on {base_meta.get('platform')} with Python {base_meta.get('python')}, "
+                  f"times are scaled by the calibrations", file=sys.stderr)
+        regressions = compare(results, baseline, args.threshold)
+        for line in regressions:
+            print(f"regression: {line}", file=sys.stderr)
+        if regressions:
+            return 1
+        print("no regression", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
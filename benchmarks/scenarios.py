@@ -0,0 +1,191 @@
+"""
+Benchmark scenarios run by benchmarks.runner.
+
+A scenario is a function taking the context and a node count, which
+builds its scene and returns the function run once per frame. Scenes use
+their own random generator with a fixed seed, so every run does the same
+work.
+"""
+
+import io
+import os
+import random
+
+import nodex
+from nodex.node import snapshot
+from nodex.spatial.spatial import SpatialHash
+from typing import *
+
+SIZE = (500, 500)
+BALL = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ball.png")
+
+Frame = Callable[[], None]
+Scenario = Callable[[nodex.Context, int], Frame]
+
+SCENARIOS: Dict[str, Scenario] = {}
+
+def scenario(function: Scenario) -> Scenario:
+    SCENARIOS[function.__name__] = function
+    return function
+
+class Mover(nodex.Node):
+    # Ball moving and bouncing off the window edges
+    def __init__(self, context, rng: random.Random, texture=None):
+        super().__init__(context, "Mover")
+        self.texture = texture
+        self.x = rng.uniform(0, SIZE[0])
+        self.y = rng.uniform(0, SIZE[1])
+        self.vx = rng.uniform(-10, 10)
+        self.vy = rng.uniform(-10, 10)
+
+    def update(self):
+        self.x += self.vx * self.context.dt
+        self.y += self.vy * self.context.dt
+        if self.x > SIZE[0] or self.x < 0:
+            self.vx *= -1
+        if self.y > SIZE[1] or self.y < 0:
+            self.vy *= -1
+        if self.texture is not None:
+            self.context.draw(self.texture, (self.x, self.y))
+
+class Receiver(nodex.Node):
+    message_types = frozenset({"hit"})
+
+    def on_message(self, type, content, source):
+        self.content["hits"] = self.content.get("hits", 0) + 1
+        return True
+
+def _random_tree(context, count: int, fanout: int = 8) -> nodex.Node:
+    root = nodex.Node(context, "Root")
+    nodes = [root]
+    for index in range(count):
+        node = nodex.Node(context, "Item")
+        if index % 3 == 0:
+            node.tags.add("enemy")
+        if index % 5 == 0:
+            node.tags.add("solid")
+        nodes[index // fanout].link(node)
+        nodes.append(node)
+    return root
+
+@scenario
+def wide_tree(context, count):
+    """Update of count children of a single root."""
+    root = nodex.Node(context, "Root")
+    for _ in range(count):
+        root.link(nodex.Node(context, "Leaf"))
+    return root.update_all
+
+@scenario
+def deep_tree(context, count):
+    """Update of a chain count nodes deep."""
+    root = node = nodex.Node(context, "Root")
+    for _ in range(count):
+        child = nodex.Node(context, "Link")
+        node.link(child)
+        node = child
+    return root.update_all
+
+@scenario
+def tag_query(context, count):
+    """Tag queries over a tree where a third of the nodes match."""
+    root = _random_tree(context, count)
+
+    def frame():
+        root.get_descendants({"enemy"})
+        root.get_descendants({"enemy", "solid"})
+        root.get_descendants({"solid"}, ignore={"enemy"})
+    return frame
+
+@scenario
+def message_storm(context, count):
+    """100 posted messages a frame, one node in 100 subscribed to them."""
+    rng = random.Random(0)
+    root = _random_tree(context, count)
+    nodes = [root] + root.get_descendants()
+    for node in rng.sample(nodes[1:], max(count // 100, 1)):
+        node.link(Receiver(context, "Receiver"))
+    sources = rng.sample(nodes, min(100, len(nodes)))
+
+    def frame():
+        for source in sources:
+            source.post("hit", {"damage": 1})
+    return frame
+
+@scenario
+def serialization(context, count):
+    """Snapshot save and load of the whole tree."""
+    root = _random_tree(context, count)
+
+    def frame():
+        stream = io.BytesIO()
+        snapshot.save(root, stream)
+        stream.seek(0)
+        snapshot.load(context, stream)
+    return frame
+
+@scenario
+def draw_heavy(context, count):
+    """count draws of one texture a frame, without any node."""
+    texture = context.load_texture(BALL)
+    rng = random.Random(0)
+    positions = [(rng.uniform(0, SIZE[0]), rng.uniform(0, SIZE[1])) for _ in range(count)]
+
+    def frame():
+        draw = context.draw
+        for position in positions:
+            draw(texture, position)
+    return frame
+
+@scenario
+def update_heavy(context, count):
+    """count moving nodes updated every frame, without drawing."""
+    rng = random.Random(0)
+    root = nodex.Node(context, "Root")
+    for _ in range(count):
+        root.link(Mover(context, rng))
+    return root.update_all
+
+@scenario
+def bouncing(context, count):
+    """count moving nodes updated and drawn every frame, 500 of them made the original benchmark."""
+    rng = random.Random(0)
+    texture = context.load_texture(BALL)
+    root = nodex.Node(context, "Root")
+    for _ in range(count):
+        root.link(Mover(context, rng, texture))
+    return root.update_all
+
+@scenario
+def collisions(context, count):
+    """count moving nodes kept in a spatial hash, with the broad phase pair list made every frame."""
+    rng = random.Random(0)
+    root = nodex.Node(context, "Root")
+    grid = SpatialHash(32)
+    for _ in range(count):
+        mover = Mover(context, rng)
+        root.link(mover)
+        grid.insert(mover, mover.x, mover.y, 8, 8)
+
+    def frame():
+        root.update_all()
+        grid.refresh()
+        grid.pairs()
+    return frame
+
+@scenario
+def scrolling(context, count):
+    """count sprites spread over a world 16 times the window, seen through a camera moving across it."""
+    texture = context.load_texture(BALL)
+    rng = random.Random(0)
+    positions = [(rng.uniform(0, SIZE[0] * 4), rng.uniform(0, SIZE[1] * 4)) for _ in range(count)]
+    camera = context.camera
+    step = [0]
+
+    def frame():
+        step[0] = (step[0] + 1) % 300
+        camera.position = (step[0] * 5, step[0] * 5)
+        draw = context.draw
+        for position in positions:
+            draw(texture, position)
+    return frame
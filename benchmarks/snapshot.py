@@ -0,0 +1,58 @@
+"""
+Time taken to save and load a scene with the binary snapshot format,
+compared with Node.serialize followed by Node.build.
+
+Usage: python -m benchmarks.snapshot [count]
+"""
+
+import io
+import random
+import sys
+import time
+
+import nodex
+from nodex.node import snapshot
+
+class Enemy(nodex.Node):
+    pass
+
+def make_scene(context, count: int) -> nodex.Node:
+    random.seed(0)
+    root = nodex.Node(context, "Scene")
+    nodes = [root]
+    for index in range(count):
+        node = Enemy(context, "Enemy") if index % 4 == 0 else nodex.Node(context, "Prop")
+        if index % 7 == 0:
+            node.tags.add("solid")
+        if index % 5 == 0:
+            node.content["hp"] = index
+        node.order = index % 3
+        random.choice(nodes[-64:]).link(node)
+        nodes.append(node)
+    return root
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+def main(count: int = 100_000) -> None:
+    context = nodex.Context((1, 1), backend="headless")
+    root = make_scene(context, count)
+    stream = io.BytesIO()
+
+    written, save_time = timed(lambda: snapshot.SnapshotWriter(stream).write(root))
+    stream.seek(0)
+    loaded, load_time = timed(lambda: snapshot.SnapshotReader(stream, context).read())
+    data, serialize_time = timed(root.serialize)
+    _, build_time = timed(lambda: nodex.Node.build(data))
+
+    print(f"{written} nodes, {len(stream.getvalue()) / 1024:.0f} KiB snapshot")
+    print(f"{'snapshot save':<20} {save_time * 1000:>8.1f} ms")
+    print(f"{'snapshot load':<20} {load_time * 1000:>8.1f} ms")
+    print(f"{'serialize':<20} {serialize_time * 1000:>8.1f} ms")
+    print(f"{'build':<20} {build_time * 1000:>8.1f} ms")
+
+if __name__ == "__main__":
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10_000))
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
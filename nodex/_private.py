@@ -1,101 +1,102 @@
-import pygame
-from pyglet.window import key as pyglet_key
+from nodex.keyboard.keyboard import LETTERS, DIGITS
+from typing import *
 
-def translate_pygame_key(key):
-    return {
+# Names the backends give to the keys missing from their tables, upper
+# cased with spaces as underscores, to the name nodex uses for the key
+# whatever the backend. Names not listed are used as they are
+KEY_ALIASES = {
+    "LEFT_ALT": "LALT",
+    "RIGHT_ALT": "RALT",
+    "LEFT_CTRL": "LCTRL",
+    "RIGHT_CTRL": "RCTRL",
+    "LEFT_SHIFT": "LSHIFT",
+    "RIGHT_SHIFT": "RSHIFT",
+    "LEFT_META": "LMETA",
+    "RIGHT_META": "RMETA",
+    "LEFT_GUI": "LMETA",
+    "RIGHT_GUI": "RMETA",
+    "LWINDOWS": "LMETA",
+    "RWINDOWS": "RMETA",
+    "LCOMMAND": "LMETA",
+    "RCOMMAND": "RMETA",
+    "ENTER": "RETURN",
+    "CAPS_LOCK": "CAPSLOCK",
+    "SCROLL_LOCK": "SCROLLLOCK",
+    "NUM_LOCK": "NUMLOCK",
+    "NUMLOCKCLEAR": "NUMLOCK",
+    "PAGE_UP": "PAGEUP",
+    "PAGE_DOWN": "PAGEDOWN",
+    "PRINT_SCREEN": "PRINT",
+    "PRINTSCREEN": "PRINT",
+    "-": "MINUS",
+    "=": "EQUAL",
+    ".": "PERIOD",
+    ",": "COMMA",
+    ";": "SEMICOLON",
+    "/": "SLASH",
+    "\\": "BACKSLASH",
+    "'": "APOSTROPHE",
+    "`": "GRAVE",
+    "[": "BRACKETLEFT",
+    "]": "BRACKETRIGHT",
+    "KP_+": "KP_ADD",
+    "KP_-": "KP_SUBTRACT",
+    "KP_*": "KP_MULTIPLY",
+    "KP_/": "KP_DIVIDE",
+    "KP_.": "KP_DECIMAL",
+    "KP_=": "KP_EQUAL",
+}
+
+# Prefixes of keypad key names: pygame's [1], SDL's Keypad 1 and pyglet's NUM_1 are KP_1
+_KEYPAD_PREFIXES = ("KEYPAD_", "NUM_")
+
+def key_name(name: str) -> str:
+    """The nodex name of a key from the name its backend gives it, empty if it has none."""
+    name = name.upper().replace(" ", "_")
+    if len(name) > 2 and name[0] == "[" and name[-1] == "]":
+        name = "KP_" + name[1:-1]
+    else:
+        for prefix in _KEYPAD_PREFIXES:
+            if name.startswith(prefix) and name != "NUM_LOCK":
+                name = "KP_" + name[len(prefix):]
+                break
+    return KEY_ALIASES.get(name, name)
+
+# Backend key codes to nodex key names, filled the first time a key of the
+# backend is translated so that only the backend in use gets imported.
+# Keys met that are not listed are added under their key_name
+PYGAME_KEYS: Dict[int, str] = {}
+PYGLET_KEYS: Dict[int, str] = {}
+
+def _fill_pygame_keys():
+    import pygame
+    PYGAME_KEYS.update({
         pygame.K_LEFT : "LEFT",
         pygame.K_RIGHT : "RIGHT",
         pygame.K_UP : "UP",
         pygame.K_DOWN : "DOWN",
         pygame.K_SPACE : "SPACE",
-        pygame.K_a : "A",
-        pygame.K_b : "B",
-        pygame.K_c : "C",
-        pygame.K_d : "D",
-        pygame.K_e : "E",
-        pygame.K_f : "F",
-        pygame.K_g : "G",
-        pygame.K_h : "H",
-        pygame.K_i : "I",
-        pygame.K_j : "J",
-        pygame.K_k : "K",
-        pygame.K_l : "L",
-        pygame.K_m : "M",
-        pygame.K_n : "N",
-        pygame.K_o : "O",
-        pygame.K_p : "P",
-        pygame.K_q : "Q",
-        pygame.K_r : "R",
-        pygame.K_s : "S",
-        pygame.K_t : "T",
-        pygame.K_u : "U",
-        pygame.K_v : "V",
-        pygame.K_w : "W",
-        pygame.K_x : "X",
-        pygame.K_y : "Y",
-        pygame.K_z : "Z",
-        pygame.K_0 : "0",
-        pygame.K_1 : "1",
-        pygame.K_2 : "2",
-        pygame.K_3 : "3",
-        pygame.K_4 : "4",
-        pygame.K_5 : "5",
-        pygame.K_6 : "6",
-        pygame.K_7 : "7",
-        pygame.K_8 : "8",
-        pygame.K_9 : "9",
+        **{getattr(pygame, "K_" + letter.lower()) : letter for letter in LETTERS},
+        **{getattr(pygame, "K_" + digit) : digit for digit in DIGITS},
         pygame.K_LCTRL  :    "LCTRL",
         pygame.K_RCTRL  :    "RCTRL",
         pygame.K_LSHIFT :   "LSHIFT",
         pygame.K_RSHIFT :   "RSHIFT",
         pygame.K_BACKSPACE : "BACKSPACE",
         pygame.K_KP_ENTER : "KP_ENTER",
-        pygame.K_ESCAPE : "ESCAPE"
-    }[key]
+        pygame.K_ESCAPE : "ESCAPE",
+    })
 
-def translate_pyglet_key(key):
-    return {
+def _fill_pyglet_keys():
+    from pyglet.window import key as pyglet_key
+    PYGLET_KEYS.update({
         pyglet_key.LEFT : "LEFT",
         pyglet_key.RIGHT : "RIGHT",
         pyglet_key.UP : "UP",
         pyglet_key.DOWN : "DOWN",
         pyglet_key.SPACE : "SPACE",
-        pyglet_key.A : "A",
-        pyglet_key.B : "B",
-        pyglet_key.C : "C",
-        pyglet_key.D : "D",
-        pyglet_key.E : "E",
-        pyglet_key.F : "F",
-        pyglet_key.G : "G",
-        pyglet_key.H : "H",
-        pyglet_key.I : "I",
-        pyglet_key.J : "J",
-        pyglet_key.K : "K",
-        pyglet_key.L : "L",
-        pyglet_key.M : "M",
-        pyglet_key.N : "N",
-        pyglet_key.O : "O",
-        pyglet_key.P : "P",
-        pyglet_key.Q : "Q",
-        pyglet_key.R : "R",
-        pyglet_key.S : "S",
-        pyglet_key.T : "T",
-        pyglet_key.U : "U",
-        pyglet_key.V : "V",
-        pyglet_key.W : "W",
-        pyglet_key.X : "X",
-        pyglet_key.Y : "Y",
-        pyglet_key.Z : "Z",
-        pyglet_key._0: 0,
-        pyglet_key._1: 1,
-        pyglet_key._2: 2,
-        pyglet_key._3: 3,
-        pyglet_key._4: 4,
-        pyglet_key._5: 5,
-        pyglet_key._6: 6,
-        pyglet_key._7: 7,
-        pyglet_key._8: 8,
-        pyglet_key._9: 9,
+        **{getattr(pyglet_key, letter) : letter for letter in LETTERS},
+        **{getattr(pyglet_key, "_" + digit) : digit for digit in DIGITS},
         pyglet_key.LCTRL  :    "LCTRL",
         pyglet_key.RCTRL  :    "RCTRL",
         pyglet_key.LSHIFT :   "LSHIFT",
@@ -103,4 +104,24 @@ def translate_pyglet_key(key):
         pyglet_key.BACKSPACE : "BACKSPACE",
         pyglet_key.NUM_ENTER : "KP_ENTER",
         pyglet_key.ESCAPE : "ESCAPE",
-    }[key]
\ No newline at end of file
+    })
+
+def translate_pygame_key(key):
+    name = PYGAME_KEYS.get(key)
+    if name is None:
+        if not PYGAME_KEYS:
+            _fill_pygame_keys()
+            return translate_pygame_key(key)
+        import pygame
+        name = PYGAME_KEYS[key] = key_name(pygame.key.name(key)) or f"KEY_{key}"
+    return name
+
+def translate_pyglet_key(key):
+    name = PYGLET_KEYS.get(key)
+    if name is None:
+        if not PYGLET_KEYS:
+            _fill_pyglet_keys()
+            return translate_pyglet_key(key)
+        from pyglet.window import key as pyglet_key
+        name = PYGLET_KEYS[key] = key_name(pyglet_key.symbol_string(key)) or f"KEY_{key}"
+    return name
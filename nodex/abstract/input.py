@@ -3,4 +3,8 @@ from abc import *
 class AbstractInput:
     @abstractmethod
     def events(self):
-        pass        
\ No newline at end of file
+        """
+        Yields the SystemEvent of every input since the last call. The same
+        event object may be yielded again with new values.
+        """
+        pass
@@ -1,14 +1,28 @@
 from abc import * 
 from typing import *
+from itertools import repeat
 from nodex.abstract.texture import *
 from nodex.abstract.window import *
 
 class AbstractRenderer(ABC):
     def __init__(self, target: AbstractWindow):
         self.target = target
+        # Draw commands of the current frame, submitted in bulk by present()
+        self.commands: List[Tuple[Any, Tuple[int, int]]] = []
         
-    @abstractmethod
     def draw(self, texture: AbstractTexture, position : Tuple[int, int]):
+        self.commands.append((texture, position))
+    
+    def draw_many(self, texture: AbstractTexture, positions: Iterable[Tuple[int, int]]):
+        self.commands.extend(zip(repeat(texture), positions))
+    
+    def flush(self):
+        if self.commands:
+            self.submit(self.commands)
+            self.commands.clear()
+    
+    @abstractmethod
+    def submit(self, commands: List[Tuple[Any, Tuple[int, int]]]):
         pass
     
     @abstractmethod
@@ -20,4 +34,4 @@ class AbstractRenderer(ABC):
         pass
     
     
-    
\ No newline at end of file
+    
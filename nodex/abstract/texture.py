@@ -1,12 +1,37 @@
 from abc import * 
 from typing import *
 
+import copy
+import os
+import tempfile
+
 class AbstractTexture(ABC):
     @abstractmethod
-    def __init__(self, path: str) -> None:
-        pass 
-    def slice(self, slicing: Tuple[int, int]) -> None:
+    def __init__(self, path: str, image: Any = None) -> None:
         pass 
+
+    @staticmethod
+    def decode(path: str) -> Any:
+        # Reads the file into an image passed back to __init__, safe to run
+        # outside the main thread. Work needing the display stays in __init__
+        return None
+
+    @classmethod
+    def from_surface(cls, surface: Any) -> "AbstractTexture":
+        # A texture of a pygame surface made in memory, like an atlas page.
+        # Backends convert it in memory, this file round trip is the last
+        # resort of those that can't
+        import pygame
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "surface.png")
+            pygame.image.save(surface, path)
+            return cls(path)
+
+    @abstractmethod
+    def slice(self, rect: Tuple[int, int, int, int]) -> "AbstractTexture":
+        # A view on the (x, y, width, height) part of this texture, from its
+        # top left corner, sharing its image instead of copying it
+        pass
     @abstractmethod
     def scale(self, scaling: Tuple[float, float]) -> None:
         pass
@@ -14,6 +39,23 @@ class AbstractTexture(ABC):
     def rotate(self, angle: float) -> None:
         pass
     
+    def copy(self) -> "AbstractTexture":
+        # A handle of its own, sharing the loaded image with this one
+        return copy.copy(self)
+
+    @abstractmethod
+    def zoomed(self, zoom: float) -> "AbstractTexture":
+        # This texture drawn zoom times bigger, on top of its own scaling,
+        # for cameras, itself for a zoom of 1. The view is kept until the
+        # texture or zoom changes
+        pass
+
     @property
     def size(self):
-        pass
\ No newline at end of file
+        pass
+
+    @property
+    def bounds(self) -> Tuple[int, int]:
+        # Size of the box the texture covers once drawn, scaled and rotated,
+        # what cameras cull with
+        return self.size
\ No newline at end of file
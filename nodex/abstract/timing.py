@@ -1,16 +1,127 @@
-from abc import * 
-from typing import * 
-
-class AbstractTiming:
-    @abstractmethod
-    def __init__(self, fps) -> None:
-        pass
-    
-    @abstractmethod
+from abc import *
+from collections import deque
+from typing import *
+
+import time
+
+class AbstractTiming(ABC):
+    """
+    Frame pacer shared by every backend.
+
+    tick() waits until the next frame is due, sleeping until spin seconds
+    before it and busy waiting the rest, as a sleep alone often overshoots
+    by a millisecond or more. Frames are scheduled on a fixed grid, so
+    waiting errors don't add up; a frame later than a whole frame starts
+    a new grid instead of rushing the following ones.
+
+    The last frame times are kept for stats(): percentiles, late frames
+    (over the target duration by more than late_margin) and dropped frames
+    (whole frame slots missed).
+    """
+
+    # Whether tick waits for the next frame, backends without a screen don't
+    paced: bool = True
+
+    def __init__(self, fps: float, history: int = 240, spin: float = 0.002, late_margin: float = 0.001) -> None:
+        """
+        Args:
+            fps (float): Most frames per second, 0 for no limit.
+            history (int): Number of frame times kept.
+            spin (float): Seconds busy waited at the end of a frame instead of sleeping.
+            late_margin (float): Seconds over the frame duration after which a frame counts as late.
+        """
+        self.spin: float = spin
+        self.late_margin: float = late_margin
+        self.frame_times: Deque[float] = deque(maxlen=history)
+        self.frame_count: int = 0
+        self.late_frames: int = 0
+        self.dropped_frames: int = 0
+        self.set_fps(fps)
+        self.last_time: float = time.perf_counter()
+        self._deadline: float = self.last_time
+
+    def set_fps(self, fps: float) -> None:
+        self.fps = fps
+        self.frame_duration: float = 1.0 / fps if fps else 0.0
+
+    def sleep(self, seconds: float) -> None:
+        time.sleep(seconds)
+
+    def wait(self, deadline: float) -> None:
+        """Returns at deadline, a perf_counter time, as close to it as it can."""
+        clock = time.perf_counter
+        remaining = deadline - clock() - self.spin
+        if remaining > 0:
+            self.sleep(remaining)
+        while clock() < deadline:
+            pass
+
     def tick(self) -> None:
-        pass 
-    
-    @abstractmethod
-    def get_fps(self) -> int:
-        pass 
-    
\ No newline at end of file
+        clock = time.perf_counter
+        now = clock()
+        duration = self.frame_duration
+        if self.paced and duration:
+            self._deadline += duration
+            if now < self._deadline:
+                self.wait(self._deadline)
+                now = clock()
+            elif now - self._deadline > duration:
+                # Too far behind to catch up, the grid starts over from here
+                self._deadline = now
+        elapsed = now - self.last_time
+        self.last_time = now
+        self.frame_times.append(elapsed)
+        self.frame_count += 1
+        if duration:
+            if elapsed > duration + self.late_margin:
+                self.late_frames += 1
+            missed = int(elapsed / duration) - 1
+            if missed > 0:
+                self.dropped_frames += missed
+
+    def get_fps(self) -> float:
+        """Frames per second over the kept frame times."""
+        total = sum(self.frame_times)
+        return len(self.frame_times) / total if total else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Frame time statistics over the kept frames, times are in milliseconds.
+
+        Returns:
+            dict: "fps", "mean", "p50", "p95", "p99", "max", and "late" and
+            "dropped" frame counts since the start.
+        """
+        times = sorted(self.frame_times)
+        count = len(times)
+        if not count:
+            return {"fps": 0.0, "mean": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0,
+                    "late": self.late_frames, "dropped": self.dropped_frames}
+        total = sum(times)
+        return {
+            "fps": count / total if total else 0.0,
+            "mean": total / count * 1000,
+            "p50": _percentile(times, 0.50) * 1000,
+            "p95": _percentile(times, 0.95) * 1000,
+            "p99": _percentile(times, 0.99) * 1000,
+            "max": times[-1] * 1000,
+            "late": self.late_frames,
+            "dropped": self.dropped_frames,
+        }
+
+    def histogram(self, bucket: float = 1.0) -> Dict[float, int]:
+        """Number of kept frames per frame time bucket, keyed by the bucket's start in milliseconds."""
+        counts: Dict[float, int] = {}
+        for elapsed in self.frame_times:
+            start = int(elapsed * 1000 / bucket) * bucket
+            counts[start] = counts.get(start, 0) + 1
+        return dict(sorted(counts.items()))
+
+    def reset(self) -> None:
+        """Forgets the kept frames and counts, after a loading screen for instance."""
+        self.frame_times.clear()
+        self.frame_count = self.late_frames = self.dropped_frames = 0
+        self.last_time = self._deadline = time.perf_counter()
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
@@ -0,0 +1,213 @@
+import json
+import os
+
+import pygame
+
+from nodex.abstract.texture import AbstractTexture
+from typing import *
+
+MANIFEST_VERSION = 1
+
+# (page, x, y, width, height) of an image inside the atlas
+Rect = Tuple[int, int, int, int, int]
+
+class Skyline:
+    """
+    Skyline bin packer for one page.
+
+    The packed area is kept as its top outline, a list of (x, y, width)
+    segments. Each rectangle goes where its bottom ends lowest, then
+    leftmost, which leaves little wasted space for sprite-sized images.
+    """
+
+    def __init__(self, width: int, height: int):
+        self.width: int = width
+        self.height: int = height
+        self.segments: List[List[int]] = [[0, 0, width]]
+        self.used_width: int = 0
+        self.used_height: int = 0
+
+    def insert(self, width: int, height: int) -> Optional[Tuple[int, int]]:
+        """Places a width by height rectangle and returns its position, None if it doesn't fit."""
+        best = None
+        for index in range(len(self.segments)):
+            y = self._fit(index, width, height)
+            if y is not None:
+                x = self.segments[index][0]
+                if best is None or (y + height, x) < (best[1] + height, best[0]):
+                    best = (x, y, index)
+        if best is None:
+            return None
+        x, y, index = best
+        self._place(index, x, y + height, width)
+        self.used_width = max(self.used_width, x + width)
+        self.used_height = max(self.used_height, y + height)
+        return x, y
+
+    def _fit(self, index: int, width: int, height: int) -> Optional[int]:
+        x = self.segments[index][0]
+        if x + width > self.width:
+            return None
+        y = 0
+        remaining = width
+        while remaining > 0:
+            segment_x, segment_y, segment_width = self.segments[index]
+            y = max(y, segment_y)
+            if y + height > self.height:
+                return None
+            remaining -= segment_width - (x - segment_x if segment_x < x else 0)
+            index += 1
+        return y
+
+    def _place(self, index: int, x: int, top: int, width: int) -> None:
+        segments = self.segments
+        segments.insert(index, [x, top, width])
+        end = x + width
+        # Shorten or drop the segments now under the new one
+        following = index + 1
+        while following < len(segments) and segments[following][0] < end:
+            segment = segments[following]
+            segment_end = segment[0] + segment[2]
+            if segment_end <= end:
+                del segments[following]
+            else:
+                segment[2] = segment_end - end
+                segment[0] = end
+                break
+        # Merge neighbours at the same height
+        index = 0
+        while index < len(segments) - 1:
+            if segments[index][1] == segments[index + 1][1]:
+                segments[index][2] += segments[index + 1][2]
+                del segments[index + 1]
+            else:
+                index += 1
+
+def pack(sizes: List[Tuple[int, int]], page_size: int = 2048, padding: int = 1) -> Tuple[List[Tuple[int, int, int]], List[Tuple[int, int]]]:
+    """
+    Packs rectangles into as few page_size squares as it can.
+
+    Returns:
+        tuple: The (page, x, y) of every size, in the given order, and the used size of every page.
+    """
+    order = sorted(range(len(sizes)), key=lambda index: (sizes[index][1], sizes[index][0]), reverse=True)
+    pages: List[Skyline] = []
+    positions: List[Tuple[int, int, int]] = [(0, 0, 0)] * len(sizes)
+    for index in order:
+        width, height = sizes[index]
+        if width + padding > page_size or height + padding > page_size:
+            raise ValueError(f"A {width}x{height} image does not fit in a {page_size}x{page_size} atlas page.")
+        for number, page in enumerate(pages):
+            position = page.insert(width + padding, height + padding)
+            if position is not None:
+                break
+        else:
+            pages.append(Skyline(page_size, page_size))
+            number = len(pages) - 1
+            position = pages[number].insert(width + padding, height + padding)
+        positions[index] = (number, position[0], position[1])
+    return positions, [(page.used_width, page.used_height) for page in pages]
+
+class Atlas:
+    """
+    Images packed into a few large pages, drawn through slices of them.
+
+    Every texture of an atlas is a view made by AbstractTexture.slice on
+    its page, so drawing many of them uses one image per page. Pages can be
+    kept in a cache directory as PNG files with a JSON manifest; they are
+    only packed again when a source file changed.
+
+    Example:
+        atlas = Atlas.build(context, ["ball.png", "bird.png"], cache_dir="build/atlas")
+        context.draw(atlas["ball.png"], (0, 0))
+    """
+
+    def __init__(self, pages: List[AbstractTexture], rects: Dict[str, Rect]):
+        self.pages: List[AbstractTexture] = pages
+        self.rects: Dict[str, Rect] = rects
+        self.textures: Dict[str, AbstractTexture] = {
+            name: pages[page].slice((x, y, width, height)) for name, (page, x, y, width, height) in rects.items()
+        }
+
+    def __getitem__(self, name: str) -> AbstractTexture:
+        return self.textures[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.textures
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.textures)
+
+    def __len__(self) -> int:
+        return len(self.textures)
+
+    @classmethod
+    def build(cls, context: "Context", images: Union[Iterable[str], Dict[str, str]], page_size: int = 2048,
+              padding: int = 1, cache_dir: Optional[str] = None, name: str = "atlas") -> "Atlas":
+        """
+        Packs images into an atlas, or loads it from cache_dir if it is up to date.
+
+        Args:
+            context (Context): The game context.
+            images: Paths of the images, or names mapped to paths. Paths are used as names otherwise.
+            page_size (int): Width and height of a page at most.
+            padding (int): Empty pixels kept right of and under every image.
+            cache_dir (str, optional): Directory keeping the packed pages and their manifest.
+            name (str): Name of the atlas files in cache_dir.
+        """
+        if not isinstance(images, dict):
+            images = {path: path for path in images}
+        sources = {key: [path, *_stamp(path)] for key, path in images.items()}
+        settings = {"version": MANIFEST_VERSION, "page_size": page_size, "padding": padding, "sources": sources}
+
+        if cache_dir is not None:
+            manifest_path = os.path.join(cache_dir, name + ".json")
+            manifest = _read_manifest(manifest_path)
+            if manifest is not None and all(manifest.get(key) == value for key, value in settings.items()):
+                pages = [os.path.join(cache_dir, page) for page in manifest["pages"]]
+                if all(os.path.exists(page) for page in pages):
+                    rects = {key: tuple(rect) for key, rect in manifest["rects"].items()}
+                    return cls([context.load_texture(page) for page in pages], rects)
+
+        keys = list(images)
+        surfaces = [pygame.image.load(images[key]) for key in keys]
+        positions, page_sizes = pack([surface.get_size() for surface in surfaces], page_size, padding)
+        canvases = [pygame.Surface(size, pygame.SRCALPHA, 32) for size in page_sizes]
+        rects = {}
+        for key, surface, (page, x, y) in zip(keys, surfaces, positions):
+            # Pixels blitted onto fully transparent ones are copied as they are
+            canvases[page].blit(surface, (x, y))
+            rects[key] = (page, x, y, *surface.get_size())
+
+        if cache_dir is None:
+            # Pages have no file, they are kept out of the texture cache
+            return cls([context.texture_type.from_surface(canvas) for canvas in canvases], rects)
+
+        os.makedirs(cache_dir, exist_ok=True)
+        files = _save_pages(canvases, cache_dir, name)
+        manifest = dict(settings, pages=[os.path.basename(file) for file in files], rects=rects)
+        with open(manifest_path, "w") as stream:
+            json.dump(manifest, stream, indent=1)
+        for file in files:
+            # Pages packed before under the same name must be decoded again
+            context.texture_cache.discard(context.texture_cache.key(context.backend, file))
+        return cls([context.load_texture(file) for file in files], rects)
+
+def _stamp(path: str) -> Tuple[int, int]:
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+def _read_manifest(path: str) -> Optional[dict]:
+    try:
+        with open(path) as stream:
+            return json.load(stream)
+    except (OSError, ValueError):
+        return None
+
+def _save_pages(canvases: List[pygame.Surface], directory: str, name: str) -> List[str]:
+    files = []
+    for number, canvas in enumerate(canvases):
+        file = os.path.join(directory, f"{name}-{number}.png")
+        pygame.image.save(canvas, file)
+        files.append(file)
+    return files
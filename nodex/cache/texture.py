@@ -0,0 +1,125 @@
+import os
+import weakref
+
+from collections import OrderedDict
+from nodex.abstract.texture import AbstractTexture
+from typing import *
+
+DEFAULT_BUDGET = 256 * 1024 * 1024
+
+Key = Tuple[str, str]
+
+class TextureCache:
+    """
+    Shared textures keyed by backend and file path, so every file is
+    decoded once per backend.
+
+    The cache holds its textures in least recently used order and lets go
+    of the oldest ones once they take more than budget bytes. A texture
+    still used elsewhere stays reachable through a weak reference, and is
+    handed out again without being decoded.
+
+    Textures are shared: scaling or rotating one changes it for every
+    holder. Context.load_texture(path, shared=False) gives a private copy
+    of the handle, still sharing the decoded image.
+    """
+
+    def __init__(self, budget: int = DEFAULT_BUDGET):
+        """
+        Args:
+            budget (int): Bytes of texture data the cache keeps alive on its own, counted as 4 bytes per pixel.
+        """
+        self.budget: int = budget
+        self.bytes: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self._entries: "OrderedDict[Key, Tuple[AbstractTexture, int]]" = OrderedDict()
+        self._alive: "weakref.WeakValueDictionary[Key, AbstractTexture]" = weakref.WeakValueDictionary()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Key) -> bool:
+        return key in self._entries or key in self._alive
+
+    @staticmethod
+    def key(backend: str, path: str) -> Key:
+        return backend, os.path.normcase(os.path.abspath(path))
+
+    def get(self, backend: str, path: str) -> Optional[AbstractTexture]:
+        """Returns the cached texture of path for backend, None if there is none."""
+        key = self.key(backend, path)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+        texture = self._alive.get(key)
+        if texture is not None:
+            self.hits += 1
+            self.put(key, texture)
+        return texture
+
+    def load(self, backend: str, path: str, loader: Callable[[str], AbstractTexture]) -> AbstractTexture:
+        """
+        Returns the texture of path for backend, calling loader(path) only if it isn't cached.
+        """
+        texture = self.get(backend, path)
+        if texture is None:
+            self.misses += 1
+            texture = loader(path)
+            self.put(self.key(backend, path), texture)
+        return texture
+
+    def put(self, key: Key, texture: AbstractTexture) -> None:
+        size = _texture_bytes(texture)
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.bytes -= old[1]
+        self._entries[key] = (texture, size)
+        self._alive[key] = texture
+        self.bytes += size
+        self._evict()
+
+    def discard(self, key: Key) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[1]
+        self._alive.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._alive.clear()
+        self.bytes = 0
+
+    def resize(self, budget: int) -> None:
+        self.budget = budget
+        self._evict()
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "budget": self.budget,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+        }
+
+    def _evict(self) -> None:
+        # The most recently used texture is always kept, even over budget
+        while self.bytes > self.budget and len(self._entries) > 1:
+            _, (_, size) = self._entries.popitem(last=False)
+            self.bytes -= size
+            self.evictions += 1
+
+def _texture_bytes(texture: AbstractTexture) -> int:
+    width, height = texture.size
+    return int(width) * int(height) * 4
@@ -0,0 +1,122 @@
+import weakref
+
+from collections import OrderedDict
+from typing import *
+
+DEFAULT_BUDGET = 64 * 1024 * 1024
+
+Scaling = Tuple[float, float]
+Key = Tuple[int, float, float, float]
+
+class TransformCache:
+    """
+    Scaled and rotated variants of base images, shared by every texture
+    using the same base.
+
+    Angles and scales are rounded to angle_step degrees and scale_step,
+    so a sprite turning a little every frame reuses a few variants instead
+    of transforming its image every frame. Variants are always made from
+    the base image, never from another variant, and the least recently
+    used ones are dropped once they take more than budget bytes.
+    """
+
+    def __init__(self, budget: int = DEFAULT_BUDGET, angle_step: float = 1.0, scale_step: float = 1 / 64):
+        """
+        Args:
+            budget (int): Bytes of variants kept, counted as 4 bytes per pixel.
+            angle_step (float): Angles are rounded to a multiple of this, in degrees.
+            scale_step (float): Scales are rounded to a multiple of this.
+        """
+        self.budget: int = budget
+        self.angle_step: float = angle_step
+        self.scale_step: float = scale_step
+        self.bytes: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self._entries: "OrderedDict[Key, Tuple[Any, int]]" = OrderedDict()
+        # Keys by base, so the variants of a collected base are dropped with it
+        self._keys: Dict[int, Set[Key]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def quantize(self, scaling: Scaling, angle: float) -> Tuple[Scaling, float]:
+        step = self.scale_step
+        scaling = (round(scaling[0] / step) * step, round(scaling[1] / step) * step)
+        if self.angle_step:
+            angle = round(angle / self.angle_step) * self.angle_step
+        return scaling, angle % 360
+
+    def get(self, base: Any, scaling: Scaling, angle: float,
+            transform: Callable[[Any, Scaling, float], Any], size: Callable[[Any], Tuple[int, int]]) -> Any:
+        """
+        Returns base scaled then rotated, calling transform(base, scaling, angle) only on a miss.
+
+        Args:
+            base: The untransformed image, it must support weak references.
+            scaling (tuple): Horizontal and vertical scale.
+            angle (float): Counterclockwise rotation in degrees.
+            transform (callable): Makes a variant from base and quantized values.
+            size (callable): Gives the width and height of a variant.
+        """
+        scaling, angle = self.quantize(scaling, angle)
+        if scaling == (1.0, 1.0) and angle == 0:
+            return base
+        key = (id(base), scaling[0], scaling[1], angle)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+        self.misses += 1
+        variant = transform(base, scaling, angle)
+        width, height = size(variant)
+        self._add(base, key, variant, width * height * 4)
+        return variant
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._keys.clear()
+        self.bytes = 0
+
+    def resize(self, budget: int) -> None:
+        self.budget = budget
+        self._evict()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "budget": self.budget,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def _add(self, base: Any, key: Key, variant: Any, size: int) -> None:
+        base_id = key[0]
+        keys = self._keys.get(base_id)
+        if keys is None:
+            keys = self._keys[base_id] = set()
+            weakref.finalize(base, self._drop_base, base_id)
+        keys.add(key)
+        self._entries[key] = (variant, size)
+        self.bytes += size
+        self._evict()
+
+    def _drop_base(self, base_id: int) -> None:
+        for key in self._keys.pop(base_id, ()):
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self.bytes -= entry[1]
+
+    def _evict(self) -> None:
+        while self.bytes > self.budget and self._entries:
+            key, (_, size) = self._entries.popitem(last=False)
+            self.bytes -= size
+            self.evictions += 1
+            keys = self._keys[key[0]]
+            keys.discard(key)
+
+transform_cache = TransformCache()
@@ -0,0 +1,104 @@
+from typing import *
+
+class Camera:
+    """
+    View of the world drawn through Context.draw.
+
+    A world point p is drawn at (p - position) * zoom + the viewport's top
+    left corner, so position is the world point shown at the top left of
+    the viewport. Draws whose box, from the texture's bounds, misses the
+    viewport are culled by the context before reaching the renderer.
+    Drawing isn't clipped to the viewport, sprites overlapping its edges
+    are drawn whole.
+
+    The default camera of a context shows the window with world and screen
+    coordinates equal. Culling costs every draw a bounds check, so by
+    default it only happens once the camera is moved or zoomed; culling
+    turns it on or off for good.
+    """
+
+    def __init__(self, viewport: Tuple[int, int, int, int], position: Tuple[float, float] = (0.0, 0.0), zoom: float = 1.0,
+                 culling: Optional[bool] = None):
+        """
+        Args:
+            viewport (tuple): The (x, y, width, height) screen rectangle showing the world.
+            position (tuple): World point at the top left of the viewport.
+            zoom (float): Screen pixels per world unit.
+            culling (bool, optional): Whether draws out of the viewport are dropped, None for when the camera moved.
+        """
+        self._viewport: Tuple[int, int, int, int] = tuple(viewport)
+        self._position: Tuple[float, float] = (position[0], position[1])
+        self._zoom: float = zoom
+        self._culling: Optional[bool] = culling
+        self._update()
+
+    @property
+    def viewport(self) -> Tuple[int, int, int, int]:
+        return self._viewport
+
+    @viewport.setter
+    def viewport(self, viewport: Tuple[int, int, int, int]) -> None:
+        self._viewport = tuple(viewport)
+        self._update()
+
+    @property
+    def position(self) -> Tuple[float, float]:
+        return self._position
+
+    @position.setter
+    def position(self, position: Tuple[float, float]) -> None:
+        self._position = (position[0], position[1])
+        self._update()
+
+    @property
+    def zoom(self) -> float:
+        return self._zoom
+
+    @zoom.setter
+    def zoom(self, zoom: float) -> None:
+        if zoom <= 0:
+            raise ValueError(f"The camera zoom must be positive, not {zoom}.")
+        self._zoom = zoom
+        self._update()
+
+    @property
+    def culling(self) -> Optional[bool]:
+        return self._culling
+
+    @culling.setter
+    def culling(self, culling: Optional[bool]) -> None:
+        self._culling = culling
+        self._update()
+
+    def move(self, dx: float, dy: float) -> None:
+        self.position = (self._position[0] + dx, self._position[1] + dy)
+
+    def center_on(self, point: Tuple[float, float]) -> None:
+        """Moves the camera so that the world point is at the center of the viewport."""
+        _, _, width, height = self._viewport
+        self.position = (point[0] - width / 2 / self._zoom, point[1] - height / 2 / self._zoom)
+
+    def world_to_screen(self, point: Tuple[float, float]) -> Tuple[float, float]:
+        return (point[0] - self._position[0]) * self._zoom + self.left, (point[1] - self._position[1]) * self._zoom + self.top
+
+    def screen_to_world(self, point: Tuple[float, float]) -> Tuple[float, float]:
+        return (point[0] - self.left) / self._zoom + self._position[0], (point[1] - self.top) / self._zoom + self._position[1]
+
+    @property
+    def world_rect(self) -> Tuple[float, float, float, float]:
+        """The (x, y, width, height) part of the world in the viewport, to query a spatial index for instance."""
+        _, _, width, height = self._viewport
+        return self._position[0], self._position[1], width / self._zoom, height / self._zoom
+
+    def _update(self) -> None:
+        # Values read by every Context.draw
+        self.left, self.top, width, height = self._viewport
+        self.right = self.left + width
+        self.bottom = self.top + height
+        # Screen position of the world origin
+        self.offset_x = self.left - self._position[0] * self._zoom
+        self.offset_y = self.top - self._position[1] * self._zoom
+        self.identity = self.offset_x == 0 and self.offset_y == 0 and self._zoom == 1.0
+        self.culls = self._culling if self._culling is not None else not self.identity
+        # Draws go to the renderer untouched
+        self.direct = self.identity and not self.culls
@@ -0,0 +1,166 @@
+import json
+import os
+import queue
+import threading
+
+import pygame
+
+from typing import *
+
+FORMATS = ("png", "raw")
+POLICIES = ("drop", "block")
+
+# Channel masks of 32 bit surfaces to the matching ffmpeg pixel format
+_PIXEL_FORMATS = {
+    (0xff0000, 0xff00, 0xff, 0): "bgr0",
+    (0xff0000, 0xff00, 0xff, 0xff000000): "bgra",
+    (0xff, 0xff00, 0xff0000, 0): "rgb0",
+    (0xff, 0xff00, 0xff0000, 0xff000000): "rgba",
+}
+
+class CaptureError(Exception):
+    pass
+
+class FrameCapture:
+    """
+    Streams rendered frames to disk from a writer thread.
+
+    capture() only copies the frame's pixels, in one block when the
+    surface layout allows it, and queues them; the writer thread encodes
+    them as a PNG sequence or appends them to a raw video stream. When
+    the queue is full, the "drop" policy skips the frame and counts it,
+    the "block" policy waits for the writer, slowing the game down to
+    its pace.
+
+    A raw stream is the frames' pixels back to back, in pixel_format,
+    with a JSON description next to it. It can be encoded with:
+        ffmpeg -f rawvideo -pix_fmt bgr0 -s 640x480 -r 60 -i capture.raw capture.mp4
+    """
+
+    def __init__(self, path: Union[str, BinaryIO], format: str = "png", queue_size: int = 8,
+                 policy: str = "drop", every: int = 1):
+        """
+        Args:
+            path: Directory of the PNG files, or file or binary stream of the raw video.
+            format (str): "png" or "raw".
+            queue_size (int): Frames waiting for the writer at most.
+            policy (str): "drop" or "block", what happens to a frame when the queue is full.
+            every (int): Captures one frame in every.
+        """
+        if format not in FORMATS:
+            raise ValueError(f"Frames can be captured as {' or '.join(FORMATS)}, not {format}.")
+        if policy not in POLICIES:
+            raise ValueError(f"The capture policy is {' or '.join(POLICIES)}, not {policy}.")
+        self.path = path
+        self.format: str = format
+        self.policy: str = policy
+        self.every: int = every
+        # Frames offered, queued, written and dropped so far
+        self.frames: int = 0
+        self.captured: int = 0
+        self.written: int = 0
+        self.dropped: int = 0
+        self.size: Optional[Tuple[int, int]] = None
+        self.pixel_format: Optional[str] = None
+        self.error: Optional[BaseException] = None
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue(queue_size)
+        self._stream: Optional[BinaryIO] = None
+        self._owns_stream: bool = False
+        if format == "png":
+            os.makedirs(path, exist_ok=True)
+        elif isinstance(path, str):
+            self._stream = open(path, "wb")
+            self._owns_stream = True
+        else:
+            self._stream = path
+        self._thread = threading.Thread(target=self._write_frames, name="nodex-capture", daemon=True)
+        self._thread.start()
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def capture(self, surface: pygame.Surface) -> bool:
+        """Queues the pixels of surface, returns False if the frame was skipped or dropped."""
+        if self.error is not None:
+            raise CaptureError("The capture writer failed.") from self.error
+        index = self.frames
+        self.frames += 1
+        if index % self.every:
+            return False
+        # Checked before copying, a dropped frame costs nothing
+        if self.policy == "drop" and self._queue.full():
+            self.dropped += 1
+            return False
+
+        size = surface.get_size()
+        masks = surface.get_masks()
+        pixel_format = _PIXEL_FORMATS.get(masks) if surface.get_bytesize() == 4 else None
+        if pixel_format is not None and surface.get_pitch() == size[0] * 4:
+            data = surface.get_buffer().raw
+        else:
+            pixel_format = "rgb24"
+            masks = None
+            data = pygame.image.tobytes(surface, "RGB")
+        if self.size is None:
+            self.size = size
+            self.pixel_format = pixel_format
+        elif self.format == "raw" and (size, pixel_format) != (self.size, self.pixel_format):
+            raise CaptureError(f"A raw stream keeps one frame size and format, {size} {pixel_format} "
+                               f"does not match {self.size} {self.pixel_format}.")
+
+        self._queue.put((index, data, size, masks))
+        self.captured += 1
+        return True
+
+    def close(self) -> None:
+        """Writes the queued frames and stops the writer thread."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        if self._stream is not None:
+            if self._owns_stream:
+                self._stream.close()
+                if self.size is not None:
+                    self._write_description(self.path + ".json")
+            else:
+                self._stream.flush()
+            self._stream = None
+        if self.error is not None:
+            raise CaptureError("The capture writer failed.") from self.error
+
+    def _write_description(self, path: str) -> None:
+        with open(path, "w") as stream:
+            json.dump({
+                "width": self.size[0], "height": self.size[1], "pixel_format": self.pixel_format,
+                "frames": self.written, "dropped": self.dropped,
+            }, stream, indent=1)
+
+    def _write_frames(self) -> None:
+        frames = self._queue
+        while True:
+            frame = frames.get()
+            if frame is None:
+                return
+            if self.error is not None:
+                # Frames still queued after a failure are discarded
+                continue
+            try:
+                self._write(*frame)
+            except BaseException as error:
+                self.error = error
+            else:
+                self.written += 1
+
+    def _write(self, index: int, data: bytes, size: Tuple[int, int], masks: Optional[tuple]) -> None:
+        if self.format == "raw":
+            self._stream.write(data)
+            return
+        if masks is None:
+            surface = pygame.image.frombuffer(data, size, "RGB")
+        else:
+            # Same layout as the captured surface, without its alpha
+            # channel when it had none
+            surface = pygame.Surface(size, 0, 32, masks)
+            surface.get_buffer().write(data)
+        pygame.image.save(surface, os.path.join(self.path, f"frame_{index:06d}.png"))
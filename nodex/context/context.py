@@ -2,97 +2,412 @@ import nodex
 import sys
 import time
 
-from nodex.wrappers.pygame.window import *
-from nodex.wrappers.pygame.renderer import *
-from nodex.wrappers.pygame.texture import *
-from nodex.wrappers.pygame.timing import *
-from nodex.wrappers.pygame.input import *
-
-from nodex.wrappers.sdl2.window import *
-from nodex.wrappers.sdl2.renderer import *
-from nodex.wrappers.sdl2.texture import *
-from nodex.wrappers.sdl2.timing import *
-from nodex.wrappers.sdl2.input import *
-
-from nodex.wrappers.pyglet.window import *
-from nodex.wrappers.pyglet.renderer import *
-from nodex.wrappers.pyglet.texture import *
-from nodex.wrappers.pyglet.timing import *
-from nodex.wrappers.pyglet.input import *
+from nodex.abstract.window import AbstractWindow
+from nodex.abstract.renderer import AbstractRenderer
+from nodex.abstract.texture import AbstractTexture
+from nodex.abstract.timing import AbstractTiming
+from nodex.abstract.input import AbstractInput
+from nodex.cache.texture import TextureCache
+from nodex.camera.camera import Camera
+from nodex.keyboard.keyboard import Keyboard
+from nodex.loader.loader import Preload, TextureHandle, TextureLoader
+from nodex.profiler.profiler import Profiler
 
 from typing import *
 
 DEFAULT_BACKEND = "pygame"
 REFERENCE_FPS = 60
+DEFAULT_FPS_LIMIT = 10000
+
+class DrawStats(NamedTuple):
+    # Draws asked for in a frame, and those left after culling
+    submitted: int
+    drawn: int
+
+    @property
+    def culled(self) -> int:
+        return self.submitted - self.drawn
+
+def _unprofiled(phase: str) -> None:
+    pass
+
 class Context:
-    def __init__(self, size: Tuple[int, int], backend: str = DEFAULT_BACKEND) -> None:
+    def __init__(self, size: Tuple[int, int], backend: str = DEFAULT_BACKEND, rasterize: bool = False,
+                 fps_limit: int = DEFAULT_FPS_LIMIT, tick_rate: Optional[float] = None, max_ticks: int = 5) -> None:
+        """
+        Args:
+            size (tuple): Window size.
+            backend (str): "pygame", "sdl2", "pyglet" or "headless".
+            rasterize (bool): Draw into a surface with the headless backend.
+            fps_limit (int): Most frames rendered per second.
+            tick_rate (float, optional): Simulation ticks per second, for a fixed timestep.
+            max_ticks (int): Most ticks run in one frame to catch up with a fixed timestep.
+        """
         self.backend: str = backend
+        self.rasterize: bool = rasterize
+        self._fps_limit: int = fps_limit
+        self.tick_rate: Optional[float] = tick_rate
+        self.max_ticks: int = max_ticks
+        # Ticks run in the last frame and since the start, and ticks skipped
+        # because max_ticks was reached
+        self.ticks: int = 0
+        self.tick_count: int = 0
+        self.dropped_ticks: int = 0
+        self._accumulator: float = 0.0
+        self._frame_time: float = 0.0
         self.init_backend(size)
         self.window.set_caption('Nodex Project')
         self.lt: float = time.perf_counter()
+        self.message_queue: List[Tuple[Any, str, dict]] = []
+        self.texture_cache: TextureCache = TextureCache()
+        self.loader: TextureLoader = TextureLoader(self)
+        self.profiler: Optional[Profiler] = None
+        self.keyboard: Keyboard = Keyboard()
+        self.capture: Optional["FrameCapture"] = None
+        self.camera: Camera = Camera((0, 0, size[0], size[1]))
+        # Draws of the frame being run, and of the last one
+        self.submitted: int = 0
+        self.culled: int = 0
+        self.draw_stats: DrawStats = DrawStats(0, 0)
         self._dt: float = 1
     
     @property 
     def texture_type(self) -> AbstractTexture:
-        return {
-            "pygame" : PygameTexture,
-            "sdl2" : SDLTexture,
-            "pyglet": PygletTexture,
-        }[self.backend]
+        return self._texture_type
     
     def init_backend(self, size: Tuple[int, int]) -> None:
+        # Backends are imported lazily so that a missing display or library
+        # only matters for the backend that is actually used
         if self.backend == "pygame":
+            from nodex.wrappers.pygame.window import PygameWindow
+            from nodex.wrappers.pygame.renderer import PygameRenderer
+            from nodex.wrappers.pygame.texture import PygameTexture
+            from nodex.wrappers.pygame.timing import PygameTiming
+            from nodex.wrappers.pygame.input import PygameInput
             self.window = PygameWindow(size)
             self.renderer = PygameRenderer(self.window)
-            self.timer = PygameTiming(10000)
+            self.timer = PygameTiming(self._fps_limit)
             self.input = PygameInput()
+            self._texture_type = PygameTexture
         elif self.backend == "sdl2":
+            from nodex.wrappers.sdl2.window import SDLWindow
+            from nodex.wrappers.sdl2.renderer import SDLRenderer
+            from nodex.wrappers.sdl2.texture import SDLTexture
+            from nodex.wrappers.sdl2.timing import SDLTiming
+            from nodex.wrappers.sdl2.input import SDL2Input
             self.window = SDLWindow(size)
             self.renderer = SDLRenderer(self.window)
-            self.timer = SDLTiming(10000)
+            self.timer = SDLTiming(self._fps_limit)
             self.input = SDL2Input()
+            self._texture_type = SDLTexture
         elif self.backend == "pyglet":
+            from nodex.wrappers.pyglet.window import PygletWindow
+            from nodex.wrappers.pyglet.renderer import PygletRenderer
+            from nodex.wrappers.pyglet.texture import PygletTexture
+            from nodex.wrappers.pyglet.timing import PygletTiming
+            from nodex.wrappers.pyglet.input import PygletInput
             self.window = PygletWindow(size)
             self.renderer = PygletRenderer(self.window)  # PygletRenderer is not implemented yet
-            self.timer = PygletTiming(10000)  # PygletTiming is not implemented yet
+            self.timer = PygletTiming(self._fps_limit)
             self.input = PygletInput()  # PygletInput is not implemented yet
+            self._texture_type = PygletTexture
+        elif self.backend == "headless":
+            from nodex.wrappers.headless.window import HeadlessWindow
+            from nodex.wrappers.headless.renderer import HeadlessRenderer
+            from nodex.wrappers.headless.texture import HeadlessTexture
+            from nodex.wrappers.headless.timing import HeadlessTiming
+            from nodex.wrappers.headless.input import HeadlessInput
+            self.window = HeadlessWindow(size, self.rasterize)
+            self.renderer = HeadlessRenderer(self.window)
+            self.timer = HeadlessTiming(self._fps_limit)
+            self.input = HeadlessInput()
+            self._texture_type = HeadlessTexture
         else:
             raise ValueError(f"Backend {self.backend} not known.")
             
     def delta_time(self) -> None:
-        self._dt = (time.perf_counter() - self.lt) * REFERENCE_FPS
-        self.lt = time.perf_counter()
+        # A single clock read, so no time is lost between two of them
+        now = time.perf_counter()
+        self._frame_time = now - self.lt
+        self._dt = self._frame_time * REFERENCE_FPS
+        self.lt = now
         
-    def loop(self) -> Callable[[Callable[[], None]], None]:
+    def loop(self, frames: Optional[int] = None, render: Optional[Callable[[], None]] = None) -> Callable[[Callable[[], None]], None]:
         def wrapper(game_loop: Callable[[], None]) -> None:
-            self.run(game_loop)
+            self.run(game_loop, frames, render)
         return wrapper
   
-    def run(self, game_loop: Callable[[], None]) -> None:
-        while True:
-            for event in self.input.events():
-                if event.type == nodex.QUIT:
-                    self.window.close()
-                    self.quit()
-            self.delta_time()
+    def run(self, game_loop: Callable[[], None], frames: Optional[int] = None, render: Optional[Callable[[], None]] = None) -> None:
+        """
+        Runs frames until the window is closed, or frames of them.
+
+        Without a tick rate, game_loop runs once per frame with dt the time
+        since the last frame. With one, game_loop is a simulation tick run
+        as many times as the elapsed time asks for, max_ticks at most, each
+        with the same dt. render, when given, runs once per frame after the
+        ticks, with alpha telling how far the simulation is into the next
+        tick. Without render, the draws of the frame's last tick are shown.
+        """
+        frame = 0
+        while frames is None or frame < frames:
+            self.step(game_loop, render)
+            frame += 1
+
+    def step(self, game_loop: Callable[[], None], render: Optional[Callable[[], None]] = None,
+             dt: Optional[float] = None) -> None:
+        """
+        Runs a single frame, see run.
+
+        dt, when given, replaces the time measured since the last frame,
+        in frames of REFERENCE_FPS like Context.dt, to replay or benchmark
+        at a fixed step.
+        """
+        profiler = self.profiler
+        if profiler is None:
+            mark = _unprofiled
+        else:
+            mark = profiler.mark
+            profiler.begin_frame()
+        self.handle_events()
+        self.delta_time()
+        if dt is not None:
+            self._dt = dt
+            self._frame_time = dt / REFERENCE_FPS
+        self.draw_stats = DrawStats(self.submitted, self.submitted - self.culled)
+        self.submitted = 0
+        self.culled = 0
+        mark("input")
+        # Textures decoded in the background are finished on this thread
+        self.loader.poll()
+        mark("loading")
+        if self.tick_rate is None:
             self.renderer.clear(nodex.BLACK)
             game_loop()
-            self.renderer.present()    
-            self.timer.tick()
+            mark("game_loop")
+            self.dispatch_messages()
+            mark("messages")
+            if render is not None:
+                render()
+                mark("render")
+        else:
+            ticks = self.advance(self._frame_time)
+            for _ in range(ticks):
+                if render is None:
+                    # Only the last tick's draws are presented
+                    self.renderer.clear(nodex.BLACK)
+                game_loop()
+                self.dispatch_messages()
+            mark("update")
+            if render is not None:
+                self.renderer.clear(nodex.BLACK)
+                render()
+                mark("render")
+            elif not ticks:
+                # Nothing changed, the last frame stays on screen
+                self.timer.tick()
+                mark("tick")
+                if profiler is not None:
+                    profiler.end_frame()
+                return
+        self.renderer.present()
+        mark("present")
+        if self.capture is not None:
+            self.capture.capture(self.window.display)
+            mark("capture")
+        self.timer.tick()
+        mark("tick")
+        if profiler is not None:
+            profiler.end_frame()
+
+    def advance(self, elapsed: float) -> int:
+        """
+        Adds elapsed seconds to the fixed timestep accumulator.
+
+        Returns:
+            int: The number of ticks to run, max_ticks at most. Time beyond
+            that is dropped, so a slow machine runs the simulation slower
+            instead of falling further behind every frame.
+        """
+        step = 1 / self.tick_rate
+        self._accumulator += elapsed
+        ticks = int(self._accumulator / step)
+        if ticks > self.max_ticks:
+            self.dropped_ticks += ticks - self.max_ticks
+            ticks = self.max_ticks
+            # Only the part of a tick left over is kept
+            self._accumulator %= step
+        else:
+            self._accumulator -= ticks * step
+        self.ticks = ticks
+        self.tick_count += ticks
+        self._dt = REFERENCE_FPS * step
+        return ticks
+
+    @property
+    def alpha(self) -> float:
+        """Fraction of a tick elapsed since the last one, to interpolate rendered positions."""
+        if self.tick_rate is None:
+            return 1.0
+        return min(self._accumulator * self.tick_rate, 1.0)
+
+    def handle_events(self) -> None:
+        keyboard = self.keyboard
+        keyboard.begin_frame()
+        for event in self.input.events():
+            type = event.type
+            if type == nodex.KEYDOWN:
+                keyboard.press(event.key)
+            elif type == nodex.KEYUP:
+                keyboard.release(event.key)
+            elif type == nodex.QUIT:
+                self.window.close()
+                self.quit()
+
+    def is_pressed(self, key: str) -> bool:
+        """Whether key, a name such as "LEFT" or "A", is held down this frame."""
+        return self.keyboard.is_pressed(key)
+
+    def start_capture(self, path: Union[str, BinaryIO], format: str = "png", queue_size: int = 8,
+                      policy: str = "drop", every: int = 1) -> "FrameCapture":
+        """
+        Captures every presented frame from now on, see nodex.capture.capture.FrameCapture.
+
+        Only the pygame backend, and the headless one with rasterize, have
+        frames to capture.
+        """
+        if self.backend not in ("pygame", "headless") or self.window.display is None:
+            raise ValueError(f"Frames can only be captured with the pygame backend or a rasterized headless one, not {self.backend}.")
+        # Imported here, capture needs pygame whatever the backend
+        from nodex.capture.capture import FrameCapture
+        self.stop_capture()
+        self.capture = FrameCapture(path, format, queue_size, policy, every)
+        return self.capture
+
+    def stop_capture(self) -> Optional["FrameCapture"]:
+        """Stops capturing, writes the frames still queued and returns the capture."""
+        capture, self.capture = self.capture, None
+        if capture is not None:
+            capture.close()
+        return capture
+
+    def enable_profiler(self, frames: int = 300, group_by: str = "class", node_spans: bool = False) -> Profiler:
+        """Starts profiling the frames run from now on, see nodex.profiler.profiler.Profiler."""
+        self.profiler = Profiler(frames, group_by, node_spans)
+        return self.profiler
+
+    def disable_profiler(self) -> Optional[Profiler]:
+        """Stops profiling and returns the profiler, with the frames it kept."""
+        profiler, self.profiler = self.profiler, None
+        return profiler
            
+    def post_message(self, target: Any, type: str, content: dict) -> None:
+        self.message_queue.append((target, type, content))
+
+    def dispatch_messages(self) -> None:
+        if not self.message_queue:
+            return
+        # Messages posted while dispatching are kept for the next frame
+        queue, self.message_queue = self.message_queue, []
+        # Messages sent from the same node share one traversal of its subtree
+        batches: Dict[Any, List[Tuple[str, dict]]] = {}
+        for target, type, content in queue:
+            batch = batches.get(target)
+            if batch is None:
+                batches[target] = [(type, content)]
+            else:
+                batch.append((type, content))
+        for target, messages in batches.items():
+            if len(messages) == 1:
+                target.message(*messages[0])
+            else:
+                target.message_batch(messages)
+
     def quit(self) -> None:
         sys.exit()
         
     @property
-    def fps(self) -> int:
+    def fps(self) -> float:
         return self.timer.get_fps()
+
+    @property
+    def fps_limit(self) -> float:
+        return self.timer.fps
+
+    @fps_limit.setter
+    def fps_limit(self, fps: float) -> None:
+        self.timer.set_fps(fps)
     
     @property
     def dt(self) -> float:
         return self._dt
     
-    def load_texture(self, path: str) -> AbstractTexture:
-        return self.texture_type(path)
+    def load_texture(self, path: str, shared: bool = True) -> AbstractTexture:
+        # Textures come from the cache, so a file is only decoded once. A
+        # private copy shares the image but scales and rotates on its own
+        texture = self.texture_cache.load(self.backend, path, self.texture_type)
+        return texture if shared else texture.copy()
+
+    def load_texture_async(self, path: str, placeholder: Optional[AbstractTexture] = None) -> TextureHandle:
+        # Drawn as the placeholder, or not at all, until loaded
+        return self.loader.load(path, placeholder)
+
+    def preload(self, paths: Union[str, Iterable[str]], progress: Optional[Callable[[Preload], None]] = None) -> Preload:
+        return self.loader.preload(paths, progress)
+    
+    def draw(self, texture: Union[AbstractTexture, TextureHandle], position: Tuple[int, int]) -> None:
+        if texture.__class__ is TextureHandle:
+            texture = texture.texture
+            if texture is None:
+                return
+        self.submitted += 1
+        camera = self.camera
+        if camera.direct:
+            self.renderer.draw(texture, position)
+            return
+        x, y = position
+        if not camera.identity:
+            zoom = camera.zoom
+            x = x * zoom + camera.offset_x
+            y = y * zoom + camera.offset_y
+            position = (x, y)
+            if zoom != 1.0:
+                texture = texture.zoomed(zoom)
+        # Sprites entirely out of the viewport never reach the renderer. The
+        # size is only needed for those starting left of or above it
+        if camera.culls and not (camera.left <= x < camera.right and camera.top <= y < camera.bottom):
+            width, height = texture.bounds
+            if x >= camera.right or y >= camera.bottom or x + width <= camera.left or y + height <= camera.top:
+                self.culled += 1
+                return
+        self.renderer.draw(texture, position)
     
-    def draw(self, texture: AbstractTexture, position: Tuple[int, int]) -> None:
-        self.renderer.draw(texture, position)
\ No newline at end of file
+    def draw_many(self, texture: Union[AbstractTexture, TextureHandle], positions: Iterable[Tuple[int, int]]) -> None:
+        if texture.__class__ is TextureHandle:
+            texture = texture.texture
+            if texture is None:
+                return
+        camera = self.camera
+        if not isinstance(positions, (list, tuple)):
+            positions = list(positions)
+        self.submitted += len(positions)
+        if camera.direct:
+            self.renderer.draw_many(texture, positions)
+            return
+        if not camera.identity:
+            zoom = camera.zoom
+            offset_x = camera.offset_x
+            offset_y = camera.offset_y
+            positions = [(x * zoom + offset_x, y * zoom + offset_y) for x, y in positions]
+            if zoom != 1.0:
+                texture = texture.zoomed(zoom)
+        if camera.culls:
+            width, height = texture.bounds
+            left = camera.left - width
+            top = camera.top - height
+            right = camera.right
+            bottom = camera.bottom
+            visible = [position for position in positions if left < position[0] < right and top < position[1] < bottom]
+            self.culled += len(positions) - len(visible)
+            positions = visible
+        if positions:
+            self.renderer.draw_many(texture, positions)
@@ -0,0 +1,69 @@
+from typing import *
+
+LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+DIGITS = "0123456789"
+# Keys every backend translates, in the order of their bits
+KEY_NAMES = (
+    "LEFT", "RIGHT", "UP", "DOWN", "SPACE",
+    *LETTERS, *DIGITS,
+    "LCTRL", "RCTRL", "LSHIFT", "RSHIFT", "BACKSPACE", "KP_ENTER", "ESCAPE",
+)
+
+class Keyboard:
+    """
+    Keys held down, kept as the bits of an int indexed by key name.
+
+    Context.handle_events updates it from the key events of every frame,
+    so gameplay code asks is_pressed("LEFT") instead of scanning events.
+    Keys outside KEY_NAMES get a bit the first time they are seen.
+    """
+
+    def __init__(self):
+        self._bits: Dict[str, int] = {name: 1 << index for index, name in enumerate(KEY_NAMES)}
+        # Keys held down, and keys that went down or up during the last frame
+        self.state: int = 0
+        self.pressed: int = 0
+        self.released: int = 0
+
+    def bit(self, key: str) -> int:
+        bit = self._bits.get(key)
+        if bit is None:
+            bit = self._bits[key] = 1 << len(self._bits)
+        return bit
+
+    def begin_frame(self) -> None:
+        self.pressed = 0
+        self.released = 0
+
+    def press(self, key: str) -> None:
+        bit = self.bit(key)
+        self.state |= bit
+        self.pressed |= bit
+
+    def release(self, key: str) -> None:
+        bit = self.bit(key)
+        self.state &= ~bit
+        self.released |= bit
+
+    def clear(self) -> None:
+        self.state = self.pressed = self.released = 0
+
+    def is_pressed(self, key: str) -> bool:
+        """Whether key is held down."""
+        bit = self._bits.get(key)
+        return bit is not None and self.state & bit != 0
+
+    def was_pressed(self, key: str) -> bool:
+        """Whether key went down during the last frame."""
+        bit = self._bits.get(key)
+        return bit is not None and self.pressed & bit != 0
+
+    def was_released(self, key: str) -> bool:
+        """Whether key went up during the last frame."""
+        bit = self._bits.get(key)
+        return bit is not None and self.released & bit != 0
+
+    def held(self) -> List[str]:
+        """Names of the keys held down."""
+        state = self.state
+        return [name for name, bit in self._bits.items() if state & bit]
@@ -0,0 +1,236 @@
+import os
+import queue
+import time
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from nodex.abstract.texture import AbstractTexture
+from typing import *
+
+IMAGE_EXTENSIONS = frozenset({".png", ".jpg", ".jpeg", ".bmp", ".gif", ".tga", ".webp"})
+
+class TextureHandle:
+    """
+    Texture being loaded in the background.
+
+    Context.draw and Context.draw_many draw the placeholder, or nothing,
+    until the texture is ready, then the texture itself. Scaling and
+    rotation asked for before that are applied to the texture once loaded.
+    """
+
+    def __init__(self, path: str, placeholder: Optional[AbstractTexture] = None):
+        self.path: str = path
+        self.placeholder: Optional[AbstractTexture] = placeholder
+        self.result: Optional[AbstractTexture] = None
+        self.error: Optional[BaseException] = None
+        self._transforms: List[Tuple[str, Any]] = []
+        self._callbacks: List[Callable[["TextureHandle"], None]] = []
+
+    def __repr__(self) -> str:
+        state = "ready" if self.ready else "failed" if self.error is not None else "loading"
+        return f"<TextureHandle {self.path} {state}>"
+
+    @property
+    def ready(self) -> bool:
+        return self.result is not None
+
+    @property
+    def done(self) -> bool:
+        return self.result is not None or self.error is not None
+
+    @property
+    def texture(self) -> Optional[AbstractTexture]:
+        """The texture to draw this frame, the placeholder until loaded."""
+        return self.result if self.result is not None else self.placeholder
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        texture = self.texture
+        return texture.size if texture is not None else (0, 0)
+
+    def scale(self, scaling: Tuple[float, float]) -> None:
+        if self.result is not None:
+            self.result.scale(scaling)
+        else:
+            self._transforms.append(("scale", scaling))
+
+    def rotate(self, angle: float) -> None:
+        if self.result is not None:
+            self.result.rotate(angle)
+        else:
+            self._transforms.append(("rotate", angle))
+
+    def add_done_callback(self, callback: Callable[["TextureHandle"], None]) -> None:
+        """Calls callback(handle) on the main thread once loaded or failed, right away if it already is."""
+        if self.done:
+            callback(self)
+        else:
+            self._callbacks.append(callback)
+
+    def _finish(self, result: Optional[AbstractTexture], error: Optional[BaseException] = None) -> None:
+        self.result = result
+        self.error = error
+        if result is not None:
+            for name, value in self._transforms:
+                getattr(result, name)(value)
+        self._transforms.clear()
+        callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback(self)
+
+class Preload:
+    """Progress of a group of textures loaded by TextureLoader.preload."""
+
+    def __init__(self, handles: List[TextureHandle]):
+        self.handles: List[TextureHandle] = handles
+        self.total: int = len(handles)
+        self.loaded: int = 0
+        self.failed: int = 0
+
+    @property
+    def done(self) -> bool:
+        return self.loaded + self.failed == self.total
+
+    @property
+    def progress(self) -> float:
+        """Fraction of the textures loaded or failed, from 0 to 1."""
+        return (self.loaded + self.failed) / self.total if self.total else 1.0
+
+    def __iter__(self) -> Iterator[TextureHandle]:
+        return iter(self.handles)
+
+class TextureLoader:
+    """
+    Loads textures in a pool of worker threads.
+
+    Workers only decode files with the texture type's decode(). The
+    texture is made from the decoded image on the main thread, by poll(),
+    which the context calls at the start of every frame. Loaded textures
+    go to the context's texture cache, like those of Context.load_texture.
+    """
+
+    def __init__(self, context: "Context", workers: int = 4):
+        """
+        Args:
+            context (Context): The game context.
+            workers (int): Number of decoding threads, started on the first load.
+        """
+        self.context = context
+        self.workers: int = workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Dict[Tuple[str, str], TextureHandle] = {}
+        # Filled from the worker threads, emptied by poll on the main thread
+        self._done: "queue.SimpleQueue[Tuple[Tuple[str, str], TextureHandle, Future]]" = queue.SimpleQueue()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def load(self, path: str, placeholder: Optional[AbstractTexture] = None) -> TextureHandle:
+        """
+        Starts loading path and returns its handle.
+
+        A texture already in the cache gives a handle that is ready at once,
+        and a path already loading gives a handle sharing its result.
+        """
+        context = self.context
+        cache = context.texture_cache
+        key = cache.key(context.backend, path)
+        handle = TextureHandle(path, placeholder)
+        texture = cache.get(context.backend, path)
+        if texture is not None:
+            handle._finish(texture)
+            return handle
+        loading = self._pending.get(key)
+        if loading is not None:
+            loading.add_done_callback(lambda done: handle._finish(done.result, done.error))
+            return handle
+
+        cache.misses += 1
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="nodex-loader")
+        self._pending[key] = handle
+        future = self._executor.submit(context.texture_type.decode, path)
+        future.add_done_callback(lambda future: self._done.put((key, handle, future)))
+        return handle
+
+    def preload(self, paths: Union[str, Iterable[str]], progress: Optional[Callable[[Preload], None]] = None,
+                extensions: Iterable[str] = IMAGE_EXTENSIONS) -> Preload:
+        """
+        Loads many textures at once, from a list of paths or every image of a directory tree.
+
+        Args:
+            paths: A directory, or paths of the files to load.
+            progress (callable, optional): Called with the Preload after every texture loaded or failed.
+            extensions: File extensions loaded from a directory.
+        """
+        if isinstance(paths, str):
+            extensions = {extension.lower() for extension in extensions}
+            paths = sorted(
+                os.path.join(directory, name)
+                for directory, _, names in os.walk(paths)
+                for name in names
+                if os.path.splitext(name)[1].lower() in extensions
+            )
+        group = Preload([self.load(path) for path in paths])
+
+        def on_done(handle: TextureHandle):
+            if handle.ready:
+                group.loaded += 1
+            else:
+                group.failed += 1
+            if progress is not None:
+                progress(group)
+
+        for handle in group.handles:
+            handle.add_done_callback(on_done)
+        return group
+
+    def poll(self, budget: Optional[float] = None) -> int:
+        """
+        Makes the textures of the images decoded so far, on the calling thread.
+
+        Args:
+            budget (float, optional): Seconds after which the rest waits for the next poll.
+
+        Returns:
+            int: The number of handles finished.
+        """
+        if not self._pending:
+            return 0
+        context = self.context
+        start = time.perf_counter()
+        count = 0
+        while budget is None or time.perf_counter() - start < budget:
+            try:
+                key, handle, future = self._done.get_nowait()
+            except queue.Empty:
+                break
+            del self._pending[key]
+            error = future.exception()
+            texture = None
+            if error is None:
+                try:
+                    texture = context.texture_type(handle.path, future.result())
+                except Exception as exception:
+                    error = exception
+                else:
+                    context.texture_cache.put(key, texture)
+            handle._finish(texture, error)
+            count += 1
+        return count
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Polls until nothing is loading, returns False if timeout seconds passed first."""
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while self._pending:
+            self.poll()
+            if deadline is not None and time.perf_counter() > deadline:
+                return False
+            if self._pending:
+                time.sleep(0.001)
+        return True
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
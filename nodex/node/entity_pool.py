@@ -0,0 +1,126 @@
+try:
+    import numpy as np
+except ImportError as error:
+    raise ImportError("EntityPool needs NumPy, install it with: pip install numpy") from error
+
+from nodex.node.node import *
+from typing import *
+
+Kernel = Callable[["EntityPool", float], None]
+
+class EntityPool(Node):
+    """
+    Node storing many identical entities as NumPy columns instead of one
+    Node per entity.
+
+    Entities are updated by vectorized kernels working on whole columns,
+    and drawn with a single bulk call when the pool has a texture.
+
+    Example:
+        balls = EntityPool(context, {"x": float, "y": float, "vx": float, "vy": float}, texture=ball)
+
+        @balls.kernel
+        def move(pool, dt):
+            pool["x"] += pool["vx"] * dt
+            pool["y"] += pool["vy"] * dt
+    """
+
+    def __init__(self, context: Context, fields: Union[Dict[str, Any], Iterable[str]], capacity: int = 1024,
+                 texture: Optional[AbstractTexture] = None, position: Tuple[str, str] = ("x", "y"),
+                 label: str = "EntityPool"):
+        """
+        Args:
+            context (Context): The game context.
+            fields: Column names mapped to their dtype, or only names for float64 columns.
+            capacity (int): Number of entities allocated up front, the columns grow as needed.
+            texture (AbstractTexture, optional): Texture drawn at every entity's position.
+            position (tuple): Names of the columns holding the x and y coordinates.
+            label (str): Label of the node.
+        """
+        super().__init__(context, label)
+        if not isinstance(fields, dict):
+            fields = {name: np.float64 for name in fields}
+        self.capacity: int = max(capacity, 1)
+        self.count: int = 0
+        self.columns: Dict[str, np.ndarray] = {
+            name: np.zeros(self.capacity, dtype=dtype) for name, dtype in fields.items()
+        }
+        self.kernels: List[Kernel] = []
+        self.texture: Optional[AbstractTexture] = texture
+        self.position: Tuple[str, str] = position
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        # View on the live entities, writes go straight to the column
+        return self.columns[name][:self.count]
+
+    def __setitem__(self, name: str, values: Any) -> None:
+        self.columns[name][:self.count] = values
+
+    def _reserve(self, count: int) -> None:
+        if count <= self.capacity:
+            return
+        capacity = self.capacity
+        while capacity < count:
+            capacity *= 2
+        for name, column in self.columns.items():
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:self.count] = column[:self.count]
+            self.columns[name] = grown
+        self.capacity = capacity
+
+    def spawn(self, **values: Any) -> int:
+        """Adds one entity and returns its index, missing fields are zero."""
+        index = self.count
+        self._reserve(index + 1)
+        for name, column in self.columns.items():
+            column[index] = values.get(name, 0)
+        self.count += 1
+        return index
+
+    def spawn_many(self, count: int, **values: Any) -> slice:
+        """Adds count entities at once, values may be scalars or arrays of length count."""
+        start = self.count
+        self._reserve(start + count)
+        for name, column in self.columns.items():
+            column[start:start + count] = values.get(name, 0)
+        self.count += count
+        return slice(start, start + count)
+
+    def despawn(self, index: int) -> None:
+        """Removes one entity, the last entity is moved into its index."""
+        if not 0 <= index < self.count:
+            raise IndexError(f"Entity {index} out of range for {self.count} entities.")
+        last = self.count - 1
+        if index != last:
+            for column in self.columns.values():
+                column[index] = column[last]
+        self.count = last
+
+    def despawn_where(self, mask: np.ndarray) -> int:
+        """Removes every entity where mask is True, keeping the order of the others."""
+        keep = ~np.asarray(mask, dtype=bool)
+        alive = int(keep.sum())
+        if alive != self.count:
+            for column in self.columns.values():
+                column[:alive] = column[:self.count][keep]
+        removed = self.count - alive
+        self.count = alive
+        return removed
+
+    def kernel(self, function: Kernel) -> Kernel:
+        """Registers function(pool, dt) to run on every update, usable as a decorator."""
+        self.kernels.append(function)
+        return function
+
+    def update(self):
+        dt = self.context.dt
+        for kernel in self.kernels:
+            kernel(self, dt)
+        if self.texture is not None and self.count:
+            x, y = self.position
+            positions = np.column_stack((self[x], self[y])).tolist()
+            self.context.draw_many(self.texture, positions)
+
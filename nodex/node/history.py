@@ -0,0 +1,261 @@
+from collections import deque
+
+from nodex.node.node import *
+from nodex.node.node import _constructor
+from typing import *
+
+# What is kept of a node: (type name, label, parent id, order, tags, content)
+Record = Tuple[str, str, Optional[int], int, FrozenSet[str], Optional[dict]]
+
+class Delta(NamedTuple):
+    """Changes between two checkpoints, nodes are referred to by id."""
+    # Nodes added or changed, with their new record
+    nodes: Dict[int, Record]
+    # Nodes removed from the tree
+    removed: Tuple[int, ...]
+    # Nodes whose children changed, with the ids of the new children in order
+    children: Dict[int, Tuple[int, ...]]
+
+    def __len__(self) -> int:
+        return len(self.nodes) + len(self.removed) + len(self.children)
+
+class History:
+    """
+    Bounded history of a tracked node tree, made with Node.track().
+
+    The tree reports the nodes whose content, tags or place in the tree
+    may have changed, checkpoint() turns them into a Delta against the
+    previous checkpoint. Only the oldest retained frame is stored in full,
+    every other frame is rebuilt from it and the deltas that follow it.
+
+    Content is copied down through lists, tuples, sets and dicts, anything
+    else in it, like nodes or the context, is kept by reference.
+
+    Example:
+        history = scene.track(capacity=60)
+        while running:
+            ...
+            frame = history.checkpoint()
+        history.restore(frame - 10)
+    """
+
+    def __init__(self, root: Node, capacity: int = 120):
+        if capacity < 1:
+            raise ValueError("A history keeps at least one frame.")
+        self.root: Node = root
+        self.capacity: int = capacity
+        self._changed: Set[Node] = set()
+        self._restructured: Set[Node] = set()
+        # State at the last checkpoint
+        self._nodes: Dict[int, Record] = {}
+        self._children: Dict[int, Tuple[int, ...]] = {}
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            self._nodes[node.id] = _record(node)
+            children = _ordered_children(node)
+            if children:
+                self._children[node.id] = tuple(child.id for child in children)
+                stack.extend(children)
+        # State at the oldest retained frame
+        self._base_frame: int = 0
+        self._base_nodes: Dict[int, Record] = dict(self._nodes)
+        self._base_children: Dict[int, Tuple[int, ...]] = dict(self._children)
+        self._deltas: Deque[Delta] = deque()
+
+    @property
+    def frame(self) -> int:
+        """Frame of the last checkpoint."""
+        return self._base_frame + len(self._deltas)
+
+    @property
+    def frames(self) -> range:
+        """Frames that can be restored."""
+        return range(self._base_frame, self.frame + 1)
+
+    def delta(self, frame: int) -> Delta:
+        """Returns the changes that led from frame - 1 to frame."""
+        if not self._base_frame < frame <= self.frame:
+            raise IndexError(f"No delta kept for frame {frame}.")
+        return self._deltas[frame - self._base_frame - 1]
+
+    def checkpoint(self) -> int:
+        """
+        Records the changes made since the previous checkpoint.
+
+        Returns:
+            int: The new frame.
+        """
+        delta = self._collect()
+        if len(self._deltas) == self.capacity:
+            _apply(self._base_nodes, self._base_children, self._deltas.popleft())
+            self._base_frame += 1
+        self._deltas.append(delta)
+        return self.frame
+
+    def restore(self, frame: int) -> None:
+        """
+        Puts the tree back in the state it had at frame.
+
+        Changes made since the last checkpoint are discarded, and so are the
+        frames after the restored one. Nodes removed since then are created
+        again through new_root, or their class's constructor when it doesn't
+        override new_root, under their old id.
+        """
+        if frame not in self.frames:
+            raise IndexError(f"Frame {frame} is not kept, frames are {self.frames}.")
+        # Only nodes touched after frame, or since the last checkpoint, can differ
+        pending = self._collect()
+        later = list(self._deltas)[frame - self._base_frame:]
+        ids = set(pending.nodes) | set(pending.removed) | set(pending.children)
+        for delta in later:
+            ids.update(delta.nodes, delta.removed, delta.children)
+
+        nodes = {id: self._base_nodes.get(id) for id in ids}
+        children = {id: self._base_children.get(id, ()) for id in ids}
+        for delta in list(self._deltas)[:frame - self._base_frame]:
+            for id, record in delta.nodes.items():
+                if id in ids:
+                    nodes[id] = record
+            for id in delta.removed:
+                if id in ids:
+                    nodes[id] = None
+            for id, child_ids in delta.children.items():
+                if id in ids:
+                    children[id] = child_ids
+
+        root = self.root
+        root._history = None
+        try:
+            self._rebuild(nodes, children)
+        finally:
+            root._history = self
+
+        for id, record in nodes.items():
+            if record is None:
+                self._nodes.pop(id, None)
+                self._children.pop(id, None)
+            else:
+                self._nodes[id] = record
+                if children[id]:
+                    self._children[id] = children[id]
+                else:
+                    self._children.pop(id, None)
+        for _ in later:
+            self._deltas.pop()
+        self._changed.clear()
+        self._restructured.clear()
+
+    def _rebuild(self, nodes: Dict[int, Optional[Record]], children: Dict[int, Tuple[int, ...]]) -> None:
+        root = self.root
+        # Unlinking takes whole subtrees out of the id index, so every node
+        # needed is looked up before anything moves
+        index = root._id_index
+        wanted_ids = set(nodes)
+        for id, record in nodes.items():
+            if record is not None:
+                wanted_ids.add(record[2])
+                wanted_ids.update(children[id])
+        live = {id: index[id] for id in wanted_ids if id in index}
+        created: Dict[int, Node] = {}
+        moved: List[Node] = []
+        for id, record in nodes.items():
+            node = live.get(id)
+            if record is None:
+                if node is not None and node is not root:
+                    node.unlink()
+                continue
+            type_name, label, parent_id, order, tags, content = record
+            if node is None:
+                node = created[id] = _constructor(Node._types[type_name])(root.context, label, content)
+                node.id = id
+            elif node.parent is None or node.parent.id != parent_id:
+                if node is not root:
+                    node.unlink()
+            node.label = label
+            node._order = order
+            if node._tags != tags:
+                node.tags = tags
+            node._content = _copy(content)
+            if node.parent is None and node is not root:
+                moved.append(node)
+
+        for node in moved:
+            parent_id = nodes[node.id][2]
+            parent = created.get(parent_id) or live.get(parent_id)
+            parent.link(node)
+
+        for id, child_ids in children.items():
+            if nodes[id] is None:
+                continue
+            node = created.get(id) or live[id]
+            wanted = [created.get(child_id) or live[child_id] for child_id in child_ids]
+            if (node._children or []) != wanted:
+                node.children = wanted
+
+    def _collect(self) -> Delta:
+        # Diffs the nodes reported by the tree against the last checkpoint
+        root = self.root
+        nodes = {}
+        removed = []
+        children = {}
+        for node in self._changed:
+            id = node.id
+            if node._index_root is not root:
+                if id in self._nodes:
+                    del self._nodes[id]
+                    self._children.pop(id, None)
+                    removed.append(id)
+                continue
+            record = _record(node)
+            if self._nodes.get(id) != record:
+                self._nodes[id] = nodes[id] = record
+        for node in self._restructured:
+            if node._index_root is not root:
+                continue
+            child_ids = tuple(child.id for child in _ordered_children(node))
+            if self._children.get(node.id, ()) != child_ids:
+                children[node.id] = child_ids
+                if child_ids:
+                    self._children[node.id] = child_ids
+                else:
+                    del self._children[node.id]
+        self._changed.clear()
+        self._restructured.clear()
+        return Delta(nodes, tuple(removed), children)
+
+def _apply(nodes: Dict[int, Record], children: Dict[int, Tuple[int, ...]], delta: Delta) -> None:
+    nodes.update(delta.nodes)
+    for id in delta.removed:
+        nodes.pop(id, None)
+        children.pop(id, None)
+    for id, child_ids in delta.children.items():
+        if child_ids:
+            children[id] = child_ids
+        else:
+            children.pop(id, None)
+
+def _record(node: Node) -> Record:
+    parent = node.parent
+    return (
+        node.__class__.__name__, node.label, parent.id if parent is not None else None,
+        node._order, frozenset(node._tags), _copy(node._content) or None,
+    )
+
+def _ordered_children(node: Node) -> List[Node]:
+    # Children assigned directly are only sorted on the next traversal
+    if node._children_dirty:
+        return sorted(node._children, key=lambda child: child._order, reverse=True)
+    return node._children or []
+
+def _copy(value: Any) -> Any:
+    cls = value.__class__
+    if cls is dict:
+        return {key: _copy(item) for key, item in value.items()}
+    if cls is list:
+        return [_copy(item) for item in value]
+    if cls is tuple:
+        return tuple([_copy(item) for item in value])
+    if cls is set:
+        return {_copy(item) for item in value}
+    return value
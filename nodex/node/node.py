@@ -1,46 +1,399 @@
 from nodex.context.context import *
+from nodex.node.tag_set import TagSet
 from typing import *
 
+import bisect
+import functools
+import inspect
+import time
+import weakref
+
+@functools.lru_cache(maxsize=1024)
+def _default_tags(label: str) -> FrozenSet[str]:
+    return frozenset({"@" + label})
+
+@functools.lru_cache(maxsize=None)
+def _message_keys(cls: type) -> Tuple[Optional[str], ...]:
+    # Message types a node class is routed, None standing for every type
+    if cls.message_types is not None:
+        return tuple(cls.message_types)
+    if cls.on_message is not Node.on_message:
+        return (None,)
+    return ()
+
 class Node:
+    # Subclasses without __slots__ keep a __dict__ for their own attributes,
+    # which CPython only allocates once one is set
+    __slots__ = (
+        "context", "label", "update_", "parent", "id",
+        "_children", "_tags", "_content", "_debug_info",
+        "_order", "_children_dirty", "_plan",
+        "_index_root", "_tag_index", "_id_index", "_message_index", "_history",
+        "__dict__", "__weakref__",
+    )
     _id_counter = 0
+    # Node classes by name, used to rebuild serialized trees
+    _types: Dict[str, type] = {}
+    # Message types handled by on_message, None to receive every type when
+    # on_message is overridden. Other types pass through as if it returned True
+    message_types: Optional[FrozenSet[str]] = None
         
     def __init__(self, context: Context, label: str = "Node"):
         self.context: Context = context
         self.label: str = label
         self.update_: bool = True
-        self.children: List["Node"] = []
-        self.tags: Set[str] = set({"@" + label})
+        # Containers are created on first use, until then the empty ones
+        # are None and the tags are a frozenset shared by every node of this label
+        self._children: List["Node"] | None = None
+        self._tags: Set[str] = _default_tags(label)
         self.parent: "Node" | None = None
-        self.order: int = 0
+        self._order: int = 0
+        self._children_dirty: bool = False
+        self._plan = None
+        # Root of the indexed tree this node belongs to, if it is indexed
+        self._index_root: "Node" | None = None
+        self._tag_index: Dict[str, Set["Node"]] | None = None
+        self._id_index: "weakref.WeakValueDictionary[int, Node]" | None = None
+        self._message_index: Dict[Optional[str], Set["Node"]] | None = None
+        # Change history of the tree, only set on a tracked root
+        self._history: "History" | None = None
         self.id: int = Node._id_counter
         Node._id_counter += 1
-        self.content = {}
-        self.debug_info = {}
+        self._content: dict | None = None
+        self._debug_info: dict | None = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        Node._types[cls.__name__] = cls
 
     def _tag_filter(self, element: "Node", tags: Set[str], ignore: Set[str]) -> bool:
-        return all(tag in element.tags for tag in tags) and not any(tag in element.tags for tag in ignore)
+        return element._tags.issuperset(tags) and element._tags.isdisjoint(ignore)
+
+    @property
+    def children(self) -> List["Node"]:
+        if self._children is None:
+            self._children = []
+        return self._children
+
+    @children.setter
+    def children(self, children: List["Node"]):
+        # Children go through unlink and link, which keep their parent and
+        # the indexes right, the new list then stands as given
+        children = list(children)
+        kept = set(children)
+        if len(kept) != len(children):
+            raise ValueError("A node can't be the child of the same parent twice.")
+        for child in list(self._children or ()):
+            if child not in kept:
+                child.unlink()
+        for child in children:
+            if child.parent is not self:
+                self.link(child)
+        self._children = children
+        self._children_dirty = True
+        self.__invalidate_plan()
+        root = self._index_root
+        if root is not None and root._history is not None:
+            root._history._restructured.add(self)
+
+    @property
+    def content(self) -> dict:
+        # A tracked tree can't see writes into the dict, so every access
+        # marks the node and the history diffs it on the next checkpoint
+        root = self._index_root
+        if root is not None and root._history is not None:
+            root._history._changed.add(self)
+        if self._content is None:
+            self._content = {}
+        return self._content
+
+    @content.setter
+    def content(self, content: dict):
+        root = self._index_root
+        if root is not None and root._history is not None:
+            root._history._changed.add(self)
+        self._content = content
+
+    @property
+    def debug_info(self) -> dict:
+        if self._debug_info is None:
+            self._debug_info = {}
+        return self._debug_info
+
+    @debug_info.setter
+    def debug_info(self, debug_info: dict):
+        self._debug_info = debug_info
+
+    @property
+    def tags(self) -> Set[str]:
+        if self._tags.__class__ is frozenset:
+            self._tags = TagSet(self, self._tags)
+        return self._tags
+
+    @tags.setter
+    def tags(self, tags: Set[str]):
+        old = self._tags
+        self._tags = TagSet(self, tags)
+        self._on_tags_changed(self._tags - old, old - self._tags)
+
+    def _on_tags_changed(self, added: Iterable[str], removed: Iterable[str]):
+        root = self._index_root
+        if root is None:
+            return
+        if root._history is not None:
+            root._history._changed.add(self)
+        index = root._tag_index
+        for tag in added:
+            nodes = index.get(tag)
+            if nodes is None:
+                index[tag] = {self}
+            else:
+                nodes.add(self)
+        for tag in removed:
+            nodes = index.get(tag)
+            if nodes is not None:
+                nodes.discard(self)
+                if not nodes:
+                    del index[tag]
 
     def __children_sort(self):
-        self.children.sort(key=lambda child: child.order, reverse=True)
+        # Children are kept ordered by link and order, only a direct
+        # assignment of the children list leaves them to be sorted here
+        if self._children_dirty:
+            self._children.sort(key=lambda child: child._order, reverse=True)
+            self._children_dirty = False
+
+    @property
+    def order(self) -> int:
+        return self._order
+
+    @order.setter
+    def order(self, order: int):
+        if order == self._order:
+            return
+        self._order = order
+        parent = self.parent
+        if parent is None:
+            return
+        parent.__invalidate_plan()
+        root = self._index_root
+        if root is not None and root._history is not None:
+            root._history._changed.add(self)
+            root._history._restructured.add(parent)
+        if parent._children_dirty:
+            return
+        children = parent._children
+        index = children.index(self)
+        del children[index]
+        # A stable sort keeps the child behind the equal-order siblings that
+        # were already before it, and in front of the others
+        low = bisect.bisect_left(children, -order, key=lambda node: -node._order)
+        high = bisect.bisect_right(children, -order, lo=low, key=lambda node: -node._order)
+        children.insert(max(low, min(index, high)), self)
 
     @property
     def root(self) -> "Node":
-        return self.parent.root if self.parent is not None else self
+        node = self
+        while node.parent is not None:
+            node = node.parent
+        return node
 
     def link(self, child: "Node"):
-        self.children.append(child)
+        if child.parent is not None:
+            child.unlink()
+        children = self._children
+        if children is None:
+            children = self._children = []
+        if self._children_dirty or not children or children[-1]._order >= child._order:
+            children.append(child)
+        else:
+            # Same position a stable sort would give to the appended child
+            index = bisect.bisect_right(children, -child._order, key=lambda node: -node._order)
+            children.insert(index, child)
         child.parent = self
+        self.__invalidate_plan()
+        if child._index_root is not None:
+            # The child was the root of an indexed tree
+            child.__unindex_subtree()
+            child._tag_index = None
+            child._id_index = None
+            child._message_index = None
+            child._history = None
+        if self._index_root is not None:
+            child.__index_subtree(self._index_root)
+            if self._index_root._history is not None:
+                self._index_root._history._restructured.add(self)
 
     def unlink(self):
         if self.parent:
-            self.parent.children.remove(self)
+            self.parent._children.remove(self)
+            self.parent.__invalidate_plan()
+            root = self._index_root
+            if root is not None and root._history is not None:
+                root._history._restructured.add(self.parent)
             self.parent = None
+            if root is not None:
+                self.__unindex_subtree()
+            # Drop the references to the old tree's plan
+            stack = [self]
+            while stack:
+                node = stack.pop()
+                node._plan = None
+                if node._children:
+                    stack.extend(node._children)
+
+    def __index_subtree(self, root: "Node"):
+        index = root._tag_index
+        ids = root._id_index
+        routes = root._message_index
+        history = root._history
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            node._index_root = root
+            if history is not None:
+                history._changed.add(node)
+                # The children of a linked subtree are new to the history too
+                if node._children:
+                    history._restructured.add(node)
+            ids[node.id] = node
+            for key in _message_keys(node.__class__):
+                nodes = routes.get(key)
+                if nodes is None:
+                    routes[key] = {node}
+                else:
+                    nodes.add(node)
+            for tag in node._tags:
+                nodes = index.get(tag)
+                if nodes is None:
+                    index[tag] = {node}
+                else:
+                    nodes.add(node)
+            if node._children:
+                stack.extend(node._children)
+
+    def __unindex_subtree(self):
+        index = self._index_root._tag_index
+        ids = self._index_root._id_index
+        routes = self._index_root._message_index
+        history = self._index_root._history
+        changed = history._changed if history is not None else None
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            node._index_root = None
+            if changed is not None:
+                changed.add(node)
+            if ids.get(node.id) is node:
+                del ids[node.id]
+            for key in _message_keys(node.__class__):
+                nodes = routes.get(key)
+                if nodes is not None:
+                    nodes.discard(node)
+                    if not nodes:
+                        del routes[key]
+            for tag in node._tags:
+                nodes = index.get(tag)
+                if nodes is not None:
+                    nodes.discard(node)
+                    if not nodes:
+                        del index[tag]
+            if node._children:
+                stack.extend(node._children)
+
+    def __get_index_root(self) -> "Node":
+        # The tag, id and message indexes are built on the root the first time its tree is queried
+        root = self._index_root
+        if root is None:
+            root = self.root
+            root._tag_index = {}
+            # Weak, so that a node the index missed letting go of can still be freed
+            root._id_index = weakref.WeakValueDictionary()
+            root._message_index = {}
+            root.__index_subtree(root)
+        return root
+
+    def track(self, capacity: int = 120) -> "History":
+        """
+        Starts recording the changes made to this tree, see nodex.node.history.
+
+        Args:
+            capacity (int): Number of checkpoints kept, older ones are dropped.
+
+        Returns:
+            History: The history of the tree, the current state being its first frame.
+        """
+        from nodex.node.history import History
+
+        if self.parent is not None:
+            raise ValueError("Only the root of a tree can be tracked.")
+        root = self.__get_index_root()
+        root._history = History(root, capacity)
+        return root._history
+
+    def untrack(self):
+        """Stops recording the changes made to this tree."""
+        if self._index_root is not None:
+            self._index_root._history = None
+
+    def __tag_candidates(self, tags: Set[str]) -> Set["Node"]:
+        index = self.__get_index_root()._tag_index
+
+        candidates = None
+        for tag in tags:
+            nodes = index.get(tag)
+            if not nodes:
+                return set()
+            if candidates is None or len(nodes) < len(candidates):
+                candidates = nodes
+        return candidates
+
+    def __get_plan(self):
+        if self._plan is None:
+            self.__compile_plan()
+        return self._plan
+
+    def __invalidate_plan(self):
+        # A node without a plan never has an ancestor with one, so the walk
+        # can stop at the first node that is already invalid
+        node = self
+        while node is not None and node._plan is not None:
+            node._plan = None
+            node = node.parent
+
+    def __compile_plan(self):
+        # Flat preorder list of the subtree, ends[i] is the index right
+        # after the subtree of nodes[i] so it can be skipped in one step
+        nodes = []
+        parents = []
+        stack = [(self, -1)]
+        while stack:
+            node, parent_index = stack.pop()
+            index = len(nodes)
+            nodes.append(node)
+            parents.append(parent_index)
+            node.__children_sort()
+            if node._children:
+                stack.extend([(child, index) for child in reversed(node._children)])
+
+        ends = list(range(1, len(nodes) + 1))
+        for index in range(len(nodes) - 1, 0, -1):
+            parent_index = parents[index]
+            if ends[index] > ends[parent_index]:
+                ends[parent_index] = ends[index]
+
+        # Nodes overriding update_all handle their own subtree
+        opaque = [node.__class__.update_all is not Node.update_all for node in nodes]
+
+        plan = (nodes, ends, opaque)
+        for index, node in enumerate(nodes):
+            node._plan = (plan, index)
 
     def update(self):
         pass
     
     def serialize(self):
-        data = dict(self.content) 
+        data = dict(self._content) if self._content else {}
         data["type"] = self.__class__.__name__
         data["label"] = self.label
         data["context"] = self.context
@@ -49,51 +402,106 @@ class Node:
             data["pid"] = self.parent.id
         else:
             data["pid"] = -1
-        data["children"] = [child.serialize() for child in self.children]
+        data["children"] = [child.serialize() for child in self._children or ()]
         return data
     
     @staticmethod
     def build(data:dict) -> "Node":
-        type_map = {cls.__name__: cls for cls in _all_subclasses(Node)}
-        type_map["Node"] = Node
-        node = type_map[data["type"]].new_root(data)
-        node.children = [Node.build(child) for child in data["children"]]
+        node = Node._types[data["type"]].new_root(data)
+        for child in data["children"]:
+            node.link(Node.build(child))
         return node
     
     def new_root(data:dict) -> "Node":
         return Node(data["context"], data["label"])
     
     def search(self, id):
-        if self.id == id:
-            return self
-        for child in self.children:
-            result = child.search(id)
-            if result:
-                return result
+        node = self.__get_index_root()._id_index.get(id)
+        if node is None:
+            return None
+        # The index covers the whole tree, only return nodes of this subtree
+        ancestor = node
+        while ancestor is not None:
+            if ancestor is self:
+                return node
+            ancestor = ancestor.parent
         return None
 
     def on_message(self, type: str, content: dict, source: "Node") -> Optional[bool]:
         return True
 
     def update_all(self):
-        if self.update_:
-            self.update()
-            self.__children_sort()
-            for child in self.children:
-                child.update_all()
+        if not self.update_:
+            return
+        # Nodes may be made without a context
+        profiler = getattr(self.context, "profiler", None)
+        if profiler is not None:
+            self.__update_all_profiled(profiler)
+            return
+        (nodes, ends, opaque), start = self.__get_plan()
 
-    def get_descendants(self, tags: Set[str] = set(), ignore: Set[str] = set()) -> List["Node"]:
-        output = []
+        self.update()
+        index = start + 1
+        end = ends[start]
+        while index < end:
+            node = nodes[index]
+            if node.parent is None:
+                # Unlinked during this update, skip what is left of its subtree
+                index = ends[index]
+            elif opaque[index]:
+                node.update_all()
+                index = ends[index]
+            elif node.update_:
+                node.update()
+                index += 1
+            else:
+                index = ends[index]
 
-        def recursive_search(node: "Node"):
-            node.__children_sort()
-            for child in node.children:
-                if self._tag_filter(child, tags, ignore):
-                    output.append(child)
-                recursive_search(child)
+    def __update_all_profiled(self, profiler):
+        # Same traversal as update_all, with every update timed
+        (nodes, ends, opaque), start = self.__get_plan()
+        clock = time.perf_counter
+        record = profiler.record_node
 
-        recursive_search(self)
-        return output
+        begin = clock()
+        self.update()
+        record(self, begin, clock())
+        index = start + 1
+        end = ends[start]
+        while index < end:
+            node = nodes[index]
+            if node.parent is None:
+                index = ends[index]
+            elif opaque[index]:
+                recorded = profiler.node_time
+                begin = clock()
+                node.update_all()
+                record(node, begin, clock(), profiler.node_time - recorded)
+                index = ends[index]
+            elif node.update_:
+                begin = clock()
+                node.update()
+                record(node, begin, clock())
+                index += 1
+            else:
+                index = ends[index]
+
+    def get_descendants(self, tags: Set[str] = set(), ignore: Set[str] = set()) -> List["Node"]:
+        plan, start = self.__get_plan()
+        nodes, ends, _ = plan
+        end = ends[start]
+        if not tags:
+            return [node for node in nodes[start + 1:end] if node._tags.isdisjoint(ignore)]
+
+        # Candidates come from the tag index, the plan gives both the
+        # subtree check and the traversal order
+        indices = []
+        for node in self.__tag_candidates(tags):
+            entry = node._plan
+            if entry is not None and entry[0] is plan and start < entry[1] < end and self._tag_filter(node, tags, ignore):
+                indices.append(entry[1])
+        indices.sort()
+        return [nodes[index] for index in indices]
 
     def get_ancestors(self, tags: Set[str] = set(), ignore: Set[str] = set()) -> List["Node"]:
         output = []
@@ -109,23 +517,30 @@ class Node:
         return output
 
     def get_siblings(self, tags: Set[str] = set(), ignore: Set[str] = set()) -> List["Node"]:
-        return list(
-            filter(
-                lambda element: self._tag_filter(element, tags, ignore),
-                self.parent.children
-            )
-        )
+        parent = self.parent
+        if not tags:
+            return [node for node in parent._children if self._tag_filter(node, tags, ignore)]
+
+        plan, _ = parent.__get_plan()
+        nodes = plan[0]
+        indices = []
+        for node in self.__tag_candidates(tags):
+            entry = node._plan
+            if node.parent is parent and entry is not None and entry[0] is plan and self._tag_filter(node, tags, ignore):
+                indices.append(entry[1])
+        indices.sort()
+        return [nodes[index] for index in indices]
 
     def __repr__(self):
-        return f'<{self.label} #{self.id}' + "".join([f' {key} = {value}' for key, value in self.debug_info.items()]) + '>' 
+        return f'<{self.label} #{self.id}' + "".join([f' {key} = {value}' for key, value in (self._debug_info or {}).items()]) + '>' 
 
     def debug(self, spaces: int = 4):
         def recursive_helper(node: "Node", level: int):
-            if not node.children:
+            if not node._children:
                 print(" " * (level * spaces) + node.__repr__()[:-1] + "/>")
             else:
                 print(" " * (level * spaces) + node.__repr__())
-                for child in node.children:
+                for child in node._children:
                     recursive_helper(child, level + 1)
                 print(" " * (level * spaces) + node.__repr__()[:-1] + "/>")
 
@@ -134,22 +549,115 @@ class Node:
     def message(self, type: str, content: dict = {}, _source: "Node" = None) -> bool:
         if _source is None:
             _source = self
-        self.__children_sort()
-        for child in self.children:
-            result = child.on_message(type, content, _source)
+        plan, start = self.__get_plan()
+        nodes, ends, _ = plan
+        end = ends[start]
+
+        # Only the nodes routed this type are visited, in traversal order.
+        # The others behave as if on_message returned True
+        routes = self.__get_index_root()._message_index
+        indices = []
+        for key in (type, None):
+            for node in routes.get(key, ()):
+                entry = node._plan
+                if entry is not None and entry[0] is plan and start < entry[1] < end:
+                    indices.append(entry[1])
+        indices.sort()
+
+        skip_until = 0
+        for index in indices:
+            if index < skip_until:
+                continue
+            result = nodes[index].on_message(type, content, _source)
             if result is False:
                 return False
-            elif result is True:
-                if child.message(type, content, _source) is False:
-                    return False
             elif result is None:
-                continue
+                skip_until = ends[index]
         return True
 
-def _all_subclasses(cls):
-    subclasses = set()
-    for subclass in cls.__subclasses__():
-        subclasses.add(subclass)
-        subclasses.update(_all_subclasses(subclass))
-    return subclasses
+    def message_batch(self, messages: List[Tuple[str, dict]]) -> List[bool]:
+        """
+        Sends several messages down the subtree in a single traversal.
+
+        Each message follows the same True/False/None rules as message(),
+        messages reaching the same node are handled in the given order.
 
+        Returns:
+            list: The result message() would have returned, per message.
+        """
+        plan, start = self.__get_plan()
+        nodes, ends, _ = plan
+        end = ends[start]
+
+        routes = self.__get_index_root()._message_index
+        indices = set()
+        for key in {type for type, _ in messages} | {None}:
+            for node in routes.get(key, ()):
+                entry = node._plan
+                if entry is not None and entry[0] is plan and start < entry[1] < end:
+                    indices.add(entry[1])
+
+        results = [True] * len(messages)
+        skip_until = [0] * len(messages)
+        active = list(range(len(messages)))
+        for index in sorted(indices):
+            node = nodes[index]
+            keys = _message_keys(node.__class__)
+            stopped = False
+            for number in active:
+                type, content = messages[number]
+                if index < skip_until[number] or (type not in keys and None not in keys):
+                    continue
+                result = node.on_message(type, content, self)
+                if result is False:
+                    results[number] = False
+                    stopped = True
+                elif result is None:
+                    skip_until[number] = ends[index]
+            if stopped:
+                active = [number for number in active if results[number]]
+                if not active:
+                    break
+        return results
+
+    def post(self, type: str, content: dict = {}) -> None:
+        """Queues a message, delivered by the context once the current frame's game loop has run."""
+        self.context.post_message(self, type, content)
+
+Node._types["Node"] = Node
+
+@functools.lru_cache(maxsize=None)
+def _constructor(cls: type) -> Callable[[Context, str, Optional[dict]], Node]:
+    # Creates nodes of a saved type through new_root when the class
+    # overrides it, else through its constructor, so that the attributes
+    # the constructor sets exist
+    if cls.new_root is not Node.new_root:
+        def new_root(context: Context, label: str, content: Optional[dict] = None) -> Node:
+            data = dict(content) if content else {}
+            data["type"] = cls.__name__
+            data["label"] = label
+            data["context"] = context
+            data["init"] = ""
+            return cls.new_root(data)
+        return new_root
+
+    signature = inspect.signature(cls)
+    try:
+        signature.bind(None, label="")
+        with_label = True
+    except TypeError:
+        try:
+            signature.bind(None)
+            with_label = False
+        except TypeError:
+            raise TypeError(f"{cls.__name__}{signature} can't be created from a context and a label, "
+                            f"give it a new_root(data) method.") from None
+
+    def new(context: Context, label: str, content: Optional[dict] = None) -> Node:
+        node = cls(context, label=label) if with_label else cls(context)
+        if node.label != label:
+            node.label = label
+            if node._tags.__class__ is frozenset:
+                node._tags = _default_tags(label)
+        return node
+    return new
@@ -0,0 +1,220 @@
+import contextlib
+import gc
+import pickle
+import struct
+
+from nodex.node.node import *
+from nodex.node.node import _constructor, _default_tags
+from typing import *
+
+MAGIC = b"NDXS"
+VERSION = 1
+_HEADER = struct.Struct("<4sB")
+
+# Every chunk holds the columns of up to chunk_size nodes, in preorder:
+# (new type names, type indexes, parent indexes, labels, ids, orders, update flags)
+# followed by a second pickle mapping positions in the chunk to non default
+# tags and content. Only that second pickle can hold a Context, so it is the
+# only one going through persistent ids.
+#
+# Both are read with an unpickler that only finds the classes it was given,
+# so a snapshot can't make the reader import or call anything else.
+
+class SnapshotError(Exception):
+    pass
+
+class SnapshotWriter:
+    """
+    Writes node trees to a binary stream as flat columns of node records.
+
+    The stream starts with a small header, followed by one chunk per
+    chunk_size nodes. Each chunk carries the names of the node types it
+    introduces, so the writer never needs more than one chunk in memory.
+    """
+
+    def __init__(self, stream: BinaryIO, chunk_size: int = 16384):
+        self.stream = stream
+        self.chunk_size = chunk_size
+
+    def write(self, root: Node) -> int:
+        """
+        Writes the tree under root.
+
+        Returns:
+            int: The number of nodes written.
+        """
+        self.stream.write(_HEADER.pack(MAGIC, VERSION))
+        with _gc_paused():
+            return self._write(root)
+
+    def _write(self, root: Node) -> int:
+        stream = self.stream
+
+        def dump():
+            # A pickle per chunk, so no memo outlives the chunk it was made for
+            pickle.dump((new_types, types, parents, labels, ids, orders, bytes(flags)), stream, pickle.HIGHEST_PROTOCOL)
+            extras_pickler = pickle.Pickler(stream, pickle.HIGHEST_PROTOCOL)
+            extras_pickler.persistent_id = _persistent_id
+            extras_pickler.dump(extras)
+
+        type_indexes: Dict[type, int] = {}
+        new_types: List[str] = []
+        types, parents, labels, ids, orders, flags = [], [], [], [], [], []
+        extras: Dict[int, Tuple[Optional[List[str]], Optional[dict]]] = {}
+        count = 0
+        stack = [(root, -1)]
+        while stack:
+            node, parent_index = stack.pop()
+            cls = node.__class__
+            type_index = type_indexes.get(cls)
+            if type_index is None:
+                type_index = type_indexes[cls] = len(type_indexes)
+                new_types.append(cls.__name__)
+            types.append(type_index)
+            parents.append(parent_index)
+            labels.append(node.label)
+            ids.append(node.id)
+            orders.append(node._order)
+            flags.append(node.update_)
+            tags = node._tags
+            if tags.__class__ is not frozenset and tags != _default_tags(node.label):
+                extras[len(ids) - 1] = (list(tags), node._content or None)
+            elif node._content:
+                extras[len(ids) - 1] = (None, node._content)
+            children = node._children
+            if children:
+                if node._children_dirty:
+                    # Assigned, and not sorted yet
+                    children = sorted(children, key=lambda child: child._order, reverse=True)
+                stack.extend([(child, count) for child in reversed(children)])
+            count += 1
+            if len(ids) == self.chunk_size:
+                dump()
+                new_types = []
+                types, parents, labels, ids, orders, flags = [], [], [], [], [], []
+                extras = {}
+        if ids:
+            dump()
+        pickle.dump(None, stream, pickle.HIGHEST_PROTOCOL)
+        return count
+
+class SnapshotReader:
+    """
+    Reads node trees written by SnapshotWriter, re-injecting the context.
+
+    Nodes are created through new_root when their class overrides it,
+    otherwise through their class's constructor, called with the context
+    and the label, or the context alone. Ids, order, update_, tags and
+    content are restored as saved.
+
+    Content may only hold builtin containers and values, and the classes
+    listed in allowed; loading a snapshot referring to any other class
+    raises SnapshotError. A snapshot from an unknown source still can't be
+    trusted with the reader's memory or time.
+    """
+
+    def __init__(self, stream: BinaryIO, context: Context, allowed: Iterable[type] = ()):
+        self.stream = stream
+        self.context = context
+        self.allowed: Dict[Tuple[str, str], type] = {(cls.__module__, cls.__qualname__): cls for cls in allowed}
+
+    def read(self) -> Node:
+        magic, version = _HEADER.unpack(self.stream.read(_HEADER.size))
+        if magic != MAGIC:
+            raise SnapshotError("Not a Nodex snapshot.")
+        if version != VERSION:
+            raise SnapshotError(f"Snapshot version {version} not supported.")
+        with _gc_paused():
+            return self._read()
+
+    def _read(self) -> Node:
+        stream = self.stream
+        context = self.context
+        factories: List[Callable[[Context, str, Optional[dict]], Node]] = []
+        nodes: List[Node] = []
+        append = nodes.append
+        last_id = -1
+        while True:
+            chunk = _Unpickler(stream, {}).load()
+            if chunk is None:
+                break
+            new_types, types, parents, labels, ids, orders, flags = chunk
+            extras_unpickler = _Unpickler(stream, self.allowed)
+            extras_unpickler.persistent_load = self._persistent_load
+            extras = extras_unpickler.load()
+            for name in new_types:
+                if name not in Node._types:
+                    raise SnapshotError(f"Node type {name} is not defined.")
+                factories.append(_constructor(Node._types[name]))
+            for position, (type_index, parent_index, label, id, order, update_) in enumerate(
+                    zip(types, parents, labels, ids, orders, flags)):
+                extra = extras.get(position)
+                content = extra[1] if extra is not None else None
+                node = factories[type_index](context, label, content)
+                node.id = id
+                node._order = order
+                node.update_ = bool(update_)
+                if extra is not None and extra[0] is not None:
+                    node.tags = extra[0]
+                elif node._tags != _default_tags(label):
+                    # Tags added by the constructor, the saved node had none
+                    node.tags = _default_tags(label)
+                node._content = content
+                if parent_index >= 0:
+                    nodes[parent_index].link(node)
+                append(node)
+            if ids:
+                last_id = max(last_id, max(ids))
+
+        if not nodes:
+            raise SnapshotError("Snapshot is empty.")
+        # Nodes created after the load must not reuse a loaded id
+        Node._id_counter = max(Node._id_counter, last_id + 1)
+        return nodes[0]
+
+    def _persistent_load(self, pid: Any) -> Any:
+        if pid == "context":
+            return self.context
+        raise pickle.UnpicklingError(f"Unknown persistent id {pid!r}.")
+
+@contextlib.contextmanager
+def _gc_paused() -> Iterator[None]:
+    # Collections would walk the whole, large and acyclic, tree over and over
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+def _persistent_id(obj: Any) -> Optional[str]:
+    # The live context is not saved, the reader puts its own back
+    if isinstance(obj, Context):
+        return "context"
+    return None
+
+class _Unpickler(pickle.Unpickler):
+    def __init__(self, stream: BinaryIO, allowed: Dict[Tuple[str, str], type]):
+        super().__init__(stream)
+        self.allowed = allowed
+
+    def find_class(self, module: str, name: str) -> type:
+        cls = self.allowed.get((module, name))
+        if cls is None:
+            raise SnapshotError(f"The snapshot refers to {module}.{name}, which is not an allowed class.")
+        return cls
+
+def save(root: Node, file: Union[str, BinaryIO]) -> int:
+    """Writes the tree under root to a path or binary stream, returns the node count."""
+    if isinstance(file, str):
+        with open(file, "wb") as stream:
+            return SnapshotWriter(stream).write(root)
+    return SnapshotWriter(file).write(root)
+
+def load(context: Context, file: Union[str, BinaryIO], allowed: Iterable[type] = ()) -> Node:
+    """Reads a tree from a path or binary stream and returns its root, see SnapshotReader for allowed."""
+    if isinstance(file, str):
+        with open(file, "rb") as stream:
+            return SnapshotReader(stream, context, allowed).read()
+    return SnapshotReader(file, context, allowed).read()
@@ -0,0 +1,82 @@
+from typing import *
+
+class TagSet(set):
+    """
+    Set of tags that reports its changes to the node owning it, so the
+    tag index of the node's tree stays current.
+    """
+
+    __slots__ = ("node",)
+
+    def __init__(self, node, tags: Iterable[str] = ()):
+        super().__init__(tags)
+        self.node = node
+
+    def __reduce__(self):
+        return (set, (list(self),))
+
+    def _changed(self, before: Set[str]) -> None:
+        added = self - before
+        removed = before - self
+        if added or removed:
+            self.node._on_tags_changed(added, removed)
+
+    def add(self, tag: str) -> None:
+        if tag not in self:
+            super().add(tag)
+            self.node._on_tags_changed((tag,), ())
+
+    def discard(self, tag: str) -> None:
+        if tag in self:
+            super().discard(tag)
+            self.node._on_tags_changed((), (tag,))
+
+    def remove(self, tag: str) -> None:
+        super().remove(tag)
+        self.node._on_tags_changed((), (tag,))
+
+    def pop(self) -> str:
+        tag = super().pop()
+        self.node._on_tags_changed((), (tag,))
+        return tag
+
+    def clear(self) -> None:
+        before = set(self)
+        super().clear()
+        self._changed(before)
+
+    def update(self, *others: Iterable[str]) -> None:
+        before = set(self)
+        super().update(*others)
+        self._changed(before)
+
+    def difference_update(self, *others: Iterable[str]) -> None:
+        before = set(self)
+        super().difference_update(*others)
+        self._changed(before)
+
+    def intersection_update(self, *others: Iterable[str]) -> None:
+        before = set(self)
+        super().intersection_update(*others)
+        self._changed(before)
+
+    def symmetric_difference_update(self, other: Iterable[str]) -> None:
+        before = set(self)
+        super().symmetric_difference_update(other)
+        self._changed(before)
+
+    def __ior__(self, other: Set[str]) -> "TagSet":
+        self.update(other)
+        return self
+
+    def __iand__(self, other: Set[str]) -> "TagSet":
+        self.intersection_update(other)
+        return self
+
+    def __isub__(self, other: Set[str]) -> "TagSet":
+        self.difference_update(other)
+        return self
+
+    def __ixor__(self, other: Set[str]) -> "TagSet":
+        self.symmetric_difference_update(other)
+        return self
@@ -0,0 +1,201 @@
+import json
+import time
+
+from collections import deque
+from typing import *
+
+class FrameRecord:
+    """Timings of one profiled frame, times are perf_counter seconds."""
+
+    __slots__ = ("index", "start", "end", "phases", "nodes", "spans")
+
+    def __init__(self, index: int, start: float):
+        self.index: int = index
+        self.start: float = start
+        self.end: float = start
+        # (phase name, start, end)
+        self.phases: List[Tuple[str, float, float]] = []
+        # Key of the node's group: [seconds, update calls]
+        self.nodes: Dict[str, List[float]] = {}
+        # (key, start, end) of every node update, only kept with node_spans
+        self.spans: List[Tuple[str, float, float]] = []
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+class Profiler:
+    """
+    Opt-in frame profiler, see Context.enable_profiler.
+
+    Context.run times its phases (input, loading, game loop, messages,
+    present, tick, or update and render with a fixed timestep) and Node.update_all times every node update, grouped
+    by node class or label. Time spent in a node's own update_all
+    override is counted for it, without the updates it makes itself.
+
+    The last frames are kept in a ring buffer for stats() and for
+    export_chrome_trace(), which writes a trace viewable in chrome://tracing
+    or Perfetto. Without a profiler the context and nodes run their usual
+    code, so profiling costs nothing when disabled.
+    """
+
+    def __init__(self, frames: int = 300, group_by: str = "class", node_spans: bool = False):
+        """
+        Args:
+            frames (int): Number of frames kept.
+            group_by (str): "class" or "label", how node updates are grouped.
+            node_spans (bool): Also keep every node update for the trace, costly on big trees.
+        """
+        if group_by not in ("class", "label"):
+            raise ValueError(f"Nodes can be grouped by class or label, not {group_by}.")
+        self.group_by: str = group_by
+        self.node_spans: bool = node_spans
+        self.frames: Deque[FrameRecord] = deque(maxlen=frames)
+        self.frame_count: int = 0
+        # Seconds of node updates recorded so far, nested update_all calls
+        # are taken out of their caller's time with it
+        self.node_time: float = 0.0
+        self._frame: Optional[FrameRecord] = None
+        self._last_mark: float = 0.0
+        self._origin: float = time.perf_counter()
+
+    def begin_frame(self) -> None:
+        self._frame = FrameRecord(self.frame_count, time.perf_counter())
+        self._last_mark = self._frame.start
+
+    def mark(self, phase: str) -> None:
+        """Ends phase, which started at the previous mark or at the start of the frame."""
+        now = time.perf_counter()
+        if self._frame is not None:
+            self._frame.phases.append((phase, self._last_mark, now))
+        self._last_mark = now
+
+    def end_frame(self) -> None:
+        frame = self._frame
+        if frame is None:
+            return
+        frame.end = time.perf_counter()
+        self.frames.append(frame)
+        self.frame_count += 1
+        self._frame = None
+
+    def phase(self, name: str, start: float, end: float) -> None:
+        if self._frame is not None:
+            self._frame.phases.append((name, start, end))
+
+    def record_node(self, node: Any, start: float, end: float, excluded: float = 0.0) -> None:
+        elapsed = end - start - excluded
+        self.node_time += elapsed
+        frame = self._frame
+        if frame is None:
+            return
+        key = node.__class__.__name__ if self.group_by == "class" else node.label
+        entry = frame.nodes.get(key)
+        if entry is None:
+            frame.nodes[key] = [elapsed, 1]
+        else:
+            entry[0] += elapsed
+            entry[1] += 1
+        if self.node_spans:
+            frame.spans.append((key, start, end))
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Aggregates the kept frames, times are in milliseconds.
+
+        Returns:
+            dict: "frames" and "frame" (mean, p50, p95, max), "phases" and
+            "nodes" mapping a name to its mean and max per frame, nodes also
+            with their mean calls per frame, slowest first.
+        """
+        frames = list(self.frames)
+        count = len(frames)
+        if not count:
+            return {"frames": 0, "frame": {}, "phases": {}, "nodes": {}}
+        durations = sorted(frame.duration * 1000 for frame in frames)
+
+        phases: Dict[str, List[float]] = {}
+        nodes: Dict[str, List[float]] = {}
+        for frame in frames:
+            totals: Dict[str, float] = {}
+            for name, start, end in frame.phases:
+                totals[name] = totals.get(name, 0.0) + (end - start) * 1000
+            for name, total in totals.items():
+                entry = phases.setdefault(name, [0.0, 0.0])
+                entry[0] += total
+                entry[1] = max(entry[1], total)
+            for key, (elapsed, calls) in frame.nodes.items():
+                entry = nodes.setdefault(key, [0.0, 0.0, 0])
+                entry[0] += elapsed * 1000
+                entry[1] = max(entry[1], elapsed * 1000)
+                entry[2] += calls
+
+        def by_time(items: Dict[str, List[float]]) -> List[Tuple[str, List[float]]]:
+            return sorted(items.items(), key=lambda item: item[1][0], reverse=True)
+
+        return {
+            "frames": count,
+            "frame": {
+                "mean": sum(durations) / count,
+                "p50": _percentile(durations, 0.50),
+                "p95": _percentile(durations, 0.95),
+                "max": durations[-1],
+            },
+            "phases": {name: {"mean": total / count, "max": peak} for name, (total, peak) in by_time(phases)},
+            "nodes": {
+                key: {"mean": total / count, "max": peak, "calls": calls / count}
+                for key, (total, peak, calls) in by_time(nodes)
+            },
+        }
+
+    def report(self) -> str:
+        """Formats stats() as a table."""
+        stats = self.stats()
+        if not stats["frames"]:
+            return "No frame profiled."
+        frame = stats["frame"]
+        lines = [
+            f"{stats['frames']} frames, mean {frame['mean']:.3f} ms, p50 {frame['p50']:.3f} ms, "
+            f"p95 {frame['p95']:.3f} ms, max {frame['max']:.3f} ms",
+            f"{'phase':<32} {'mean ms':>10} {'max ms':>10}",
+        ]
+        for name, values in stats["phases"].items():
+            lines.append(f"{name:<32} {values['mean']:>10.3f} {values['max']:>10.3f}")
+        lines.append(f"{'node':<32} {'mean ms':>10} {'max ms':>10} {'calls':>10}")
+        for key, values in stats["nodes"].items():
+            lines.append(f"{key:<32} {values['mean']:>10.3f} {values['max']:>10.3f} {values['calls']:>10.1f}")
+        return "\n".join(lines)
+
+    def chrome_trace(self, first: Optional[int] = None, last: Optional[int] = None) -> Dict[str, Any]:
+        """Trace events of the kept frames numbered first to last, both included."""
+        origin = self._origin
+        events = []
+
+        def complete(name: str, category: str, start: float, end: float, thread: int, args: dict):
+            events.append({
+                "name": name, "cat": category, "ph": "X", "pid": 0, "tid": thread,
+                "ts": (start - origin) * 1e6, "dur": (end - start) * 1e6, "args": args,
+            })
+
+        for frame in self.frames:
+            if (first is not None and frame.index < first) or (last is not None and frame.index > last):
+                continue
+            nodes = {key: {"ms": elapsed * 1000, "calls": calls} for key, (elapsed, calls) in frame.nodes.items()}
+            complete(f"frame {frame.index}", "frame", frame.start, frame.end, 0, {"frame": frame.index, "nodes": nodes})
+            for name, start, end in frame.phases:
+                complete(name, "phase", start, end, 1, {"frame": frame.index})
+            for key, start, end in frame.spans:
+                complete(key, "node", start, end, 2, {"frame": frame.index})
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "metadata": {"group_by": self.group_by},
+        }
+
+    def export_chrome_trace(self, path: str, first: Optional[int] = None, last: Optional[int] = None) -> None:
+        """Writes chrome_trace(first, last) to path as JSON."""
+        with open(path, "w") as stream:
+            json.dump(self.chrome_trace(first, last), stream)
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
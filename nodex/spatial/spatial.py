@@ -0,0 +1,285 @@
+from math import floor, hypot
+from typing import *
+
+class SpatialHash:
+    """
+    Uniform grid index of axis aligned boxes, for position based queries.
+
+    Items, usually nodes, are inserted with their box and kept in every
+    cell of cell_size the box overlaps. Moving an item only touches the
+    grid when it leaves its cells, so keeping the index up to date every
+    frame costs little for items that move a few pixels. A cell_size about
+    the size of the items works best.
+
+    Example:
+        grid = SpatialHash(64)
+        grid.insert(bird, bird.x, bird.y, 32, 32)
+        ...
+        grid.move(bird, bird.x, bird.y)
+        for a, b in grid.pairs():
+            ...
+    """
+
+    def __init__(self, cell_size: float = 64, attributes: Tuple[str, str] = ("x", "y")):
+        """
+        Args:
+            cell_size (float): Width and height of a grid cell.
+            attributes (tuple): Names of the position attributes refresh() reads from the items.
+        """
+        self.cell_size: float = cell_size
+        self.attributes: Tuple[str, str] = attributes
+        self._inverse: float = 1.0 / cell_size
+        self._cells: Dict[Tuple[int, int], Set[Any]] = {}
+        # Item: [x, y, width, height, first cell x, first cell y, last cell x, last cell y]
+        self._entries: Dict[Any, List[float]] = {}
+        # Cell range ever used, the limit of nearest() searches
+        self._range: Optional[List[int]] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, item: Any) -> bool:
+        return item in self._entries
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._entries)
+
+    def bounds(self, item: Any) -> Tuple[float, float, float, float]:
+        """The (x, y, width, height) box of item."""
+        return tuple(self._entries[item][:4])
+
+    def insert(self, item: Any, x: float, y: float, width: float = 0, height: float = 0) -> None:
+        """Adds item with its box, (x, y) being its top left corner. An item already in is moved."""
+        if item in self._entries:
+            self.move(item, x, y, width, height)
+            return
+        inverse = self._inverse
+        entry = [x, y, width, height, floor(x * inverse), floor(y * inverse),
+                 floor((x + width) * inverse), floor((y + height) * inverse)]
+        self._entries[item] = entry
+        self._add(item, entry)
+
+    def remove(self, item: Any) -> None:
+        entry = self._entries.pop(item)
+        self._discard(item, entry)
+
+    def discard(self, item: Any) -> None:
+        """Removes item if it is in the index."""
+        if item in self._entries:
+            self.remove(item)
+
+    def clear(self) -> None:
+        self._cells.clear()
+        self._entries.clear()
+        self._range = None
+
+    def move(self, item: Any, x: float, y: float, width: Optional[float] = None, height: Optional[float] = None) -> None:
+        """Updates the box of item, its size is kept unless given."""
+        entry = self._entries[item]
+        if width is None:
+            width = entry[2]
+        if height is None:
+            height = entry[3]
+        inverse = self._inverse
+        x0 = floor(x * inverse)
+        y0 = floor(y * inverse)
+        x1 = floor((x + width) * inverse)
+        y1 = floor((y + height) * inverse)
+        if x0 != entry[4] or y0 != entry[5] or x1 != entry[6] or y1 != entry[7]:
+            self._discard(item, entry)
+            entry[4] = x0
+            entry[5] = y0
+            entry[6] = x1
+            entry[7] = y1
+            self._add(item, entry)
+        entry[0] = x
+        entry[1] = y
+        entry[2] = width
+        entry[3] = height
+
+    def refresh(self) -> None:
+        """Moves every item to the position its attributes hold, see attributes."""
+        x_name, y_name = self.attributes
+        move = self.move
+        for item, entry in self._entries.items():
+            x = getattr(item, x_name)
+            y = getattr(item, y_name)
+            if x != entry[0] or y != entry[1]:
+                move(item, x, y)
+
+    def query_rect(self, x: float, y: float, width: float, height: float) -> List[Any]:
+        """Items whose box overlaps the (x, y, width, height) rectangle, edges included."""
+        inverse = self._inverse
+        cells = self._cells
+        entries = self._entries
+        right = x + width
+        bottom = y + height
+        found = []
+        seen = set()
+        for cell_x in range(floor(x * inverse), floor(right * inverse) + 1):
+            for cell_y in range(floor(y * inverse), floor(bottom * inverse) + 1):
+                cell = cells.get((cell_x, cell_y))
+                if not cell:
+                    continue
+                for item in cell:
+                    if item in seen:
+                        continue
+                    seen.add(item)
+                    entry = entries[item]
+                    if entry[0] <= right and x <= entry[0] + entry[2] and entry[1] <= bottom and y <= entry[1] + entry[3]:
+                        found.append(item)
+        return found
+
+    def query_radius(self, x: float, y: float, radius: float) -> List[Any]:
+        """Items whose box is within radius of (x, y)."""
+        entries = self._entries
+        squared = radius * radius
+        found = []
+        for item in self.query_rect(x - radius, y - radius, 2 * radius, 2 * radius):
+            entry = entries[item]
+            dx = max(entry[0] - x, 0, x - entry[0] - entry[2])
+            dy = max(entry[1] - y, 0, y - entry[1] - entry[3])
+            if dx * dx + dy * dy <= squared:
+                found.append(item)
+        return found
+
+    def nearest(self, x: float, y: float, max_distance: Optional[float] = None,
+                exclude: Optional[Any] = None) -> Optional[Any]:
+        """
+        The item whose box is closest to (x, y), None if there is none.
+
+        Cells are searched in growing rings around the point, and the search
+        ends once no unsearched cell can hold a closer item.
+
+        Args:
+            max_distance (float, optional): Items further than that are ignored.
+            exclude (optional): Item left out, the one the search is made for.
+        """
+        if self._range is None:
+            return None
+        inverse = self._inverse
+        cells = self._cells
+        entries = self._entries
+        center_x = floor(x * inverse)
+        center_y = floor(y * inverse)
+        extent = self._range
+        low_x, low_y, high_x, high_y = extent
+        first_ring = max(low_x - center_x, center_x - high_x, low_y - center_y, center_y - high_y, 0)
+        last_ring = max(center_x - low_x, high_x - center_x, center_y - low_y, high_y - center_y)
+        if max_distance is not None:
+            last_ring = min(last_ring, floor(max_distance * inverse) + 1)
+        best = None
+        best_distance = max_distance if max_distance is not None else float("inf")
+
+        def consider(item):
+            nonlocal best, best_distance
+            if item is exclude:
+                return
+            entry = entries[item]
+            distance = hypot(max(entry[0] - x, 0, x - entry[0] - entry[2]),
+                             max(entry[1] - y, 0, y - entry[1] - entry[3]))
+            if distance < best_distance or (best is None and distance <= best_distance):
+                best = item
+                best_distance = distance
+
+        # Past some size rings hold more cells than the grid has items,
+        # every item is checked instead then
+        budget = len(entries)
+        for ring in range(first_ring, last_ring + 1):
+            for cell_key in _ring(center_x, center_y, ring, extent):
+                budget -= 1
+                cell = cells.get(cell_key)
+                if cell:
+                    for item in cell:
+                        consider(item)
+            # Cells past this ring are at least ring cells away from the point
+            if best is not None and best_distance <= ring * self.cell_size:
+                return best
+            if budget < 0:
+                for item in entries:
+                    consider(item)
+                return best
+        return best
+
+    def pairs(self) -> List[Tuple[Any, Any]]:
+        """
+        Broad phase: every pair of items whose boxes overlap, edges included.
+
+        Only items sharing a cell are compared, each pair is listed once.
+        """
+        entries = self._entries
+        inverse = self._inverse
+        found = []
+        append = found.append
+        for (cell_x, cell_y), cell in self._cells.items():
+            if len(cell) < 2:
+                continue
+            boxes = []
+            for item in cell:
+                entry = entries[item]
+                boxes.append((item, entry[0], entry[1], entry[0] + entry[2], entry[1] + entry[3],
+                              entry[4] == entry[6] and entry[5] == entry[7]))
+            for index, (a, ax, ay, ar, ab, single) in enumerate(boxes):
+                for b, bx, by, br, bb, other_single in boxes[index + 1:]:
+                    if bx <= ar and ax <= br and by <= ab and ay <= bb:
+                        # Items spanning several cells share more than this
+                        # one, the pair is only listed in the cell holding
+                        # the top left corner of their overlap
+                        if (single and other_single) or (
+                                floor((ax if ax > bx else bx) * inverse) == cell_x
+                                and floor((ay if ay > by else by) * inverse) == cell_y):
+                            append((a, b))
+        return found
+
+    def _add(self, item: Any, entry: List[float]) -> None:
+        cells = self._cells
+        x0, y0, x1, y1 = entry[4], entry[5], entry[6], entry[7]
+        for cell_x in range(x0, x1 + 1):
+            for cell_y in range(y0, y1 + 1):
+                cell = cells.get((cell_x, cell_y))
+                if cell is None:
+                    cells[(cell_x, cell_y)] = {item}
+                else:
+                    cell.add(item)
+        extent = self._range
+        if extent is None:
+            self._range = [x0, y0, x1, y1]
+        else:
+            if x0 < extent[0]:
+                extent[0] = x0
+            if y0 < extent[1]:
+                extent[1] = y0
+            if x1 > extent[2]:
+                extent[2] = x1
+            if y1 > extent[3]:
+                extent[3] = y1
+
+    def _discard(self, item: Any, entry: List[float]) -> None:
+        cells = self._cells
+        for cell_x in range(entry[4], entry[6] + 1):
+            for cell_y in range(entry[5], entry[7] + 1):
+                key = (cell_x, cell_y)
+                cell = cells[key]
+                cell.discard(item)
+                if not cell:
+                    del cells[key]
+
+def _ring(center_x: int, center_y: int, ring: int, extent: List[int]) -> Iterator[Tuple[int, int]]:
+    # Cells ring cells away from the center one, along the square around
+    # it, within the extent cell range
+    low_x, low_y, high_x, high_y = extent
+    if ring == 0:
+        yield center_x, center_y
+        return
+    start_x = max(center_x - ring, low_x)
+    end_x = min(center_x + ring, high_x) + 1
+    for row in (center_y - ring, center_y + ring):
+        if low_y <= row <= high_y:
+            for cell_x in range(start_x, end_x):
+                yield cell_x, row
+    start_y = max(center_y - ring + 1, low_y)
+    end_y = min(center_y + ring - 1, high_y) + 1
+    for column in (center_x - ring, center_x + ring):
+        if low_x <= column <= high_x:
+            for cell_y in range(start_y, end_y):
+                yield column, cell_y
@@ -1,21 +1,42 @@
 class SystemEvent:
     """
-    Represents a generic event with a type and optional custom attributes.
+    Represents a generic event with a type, an optional key and optional custom attributes.
+
+    Inputs may yield the same event object again with new values through
+    set(), so an event is only valid until the next one is read. Keep
+    its values, not the event itself.
 
     Attributes:
-        type (str): The type or name of the event.
+        type (int): The type of the event, nodex.KEYDOWN, nodex.KEYUP or nodex.QUIT.
+        key (str): The name of the key for key events, None otherwise.
+        code (int): The backend's code of the key, None otherwise.
         Other attributes are dynamically added via keyword arguments.
     """
 
-    def __init__(self, type, **kwargs):
+    # Events from the inputs never get a __dict__, custom ones do
+    __slots__ = ("type", "key", "code", "__dict__")
+
+    def __init__(self, type, key=None, code=None, **kwargs):
         """
         Initialize a new Event object.
 
         Args:
-            type (str): The type or name of the event.
+            type (int): The type of the event.
+            key (str, optional): The name of the key.
+            code (int, optional): The backend's code of the key.
             **kwargs: Arbitrary keyword arguments that will be set as attributes of the event.
-
         """
-        self.type = type 
+        self.type = type
+        self.key = key
+        self.code = code
         for kwarg in kwargs:
-            setattr(self, kwarg, kwargs[kwarg])
\ No newline at end of file
+            setattr(self, kwarg, kwargs[kwarg])
+
+    def set(self, type, key=None, code=None):
+        self.type = type
+        self.key = key
+        self.code = code
+        return self
+
+    def __repr__(self):
+        return f"SystemEvent({self.type}, key={self.key!r})"
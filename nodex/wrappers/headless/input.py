@@ -0,0 +1,15 @@
+from nodex.abstract.input import AbstractInput
+from nodex.system_event.system_event import SystemEvent
+
+class HeadlessInput(AbstractInput):
+    def __init__(self):
+        self.queue = []
+
+    def post(self, event: SystemEvent) -> None:
+        self.queue.append(event)
+
+    def events(self):
+        if not self.queue:
+            return ()
+        events, self.queue = self.queue, []
+        return events
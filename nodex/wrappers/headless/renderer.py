@@ -0,0 +1,28 @@
+from nodex.abstract.renderer import *
+from nodex.wrappers.headless.texture import HeadlessTexture
+from nodex.wrappers.headless.window import HeadlessWindow
+from typing import *
+
+class HeadlessRenderer(AbstractRenderer):
+    def __init__(self, window: HeadlessWindow):
+        super().__init__(window)
+        self.window = window
+
+    def draw(self, texture: HeadlessTexture, position: Tuple[int, int]):
+        if self.window.display is not None:
+            self.commands.append((texture.texture, position))
+
+    def draw_many(self, texture: HeadlessTexture, positions: Iterable[Tuple[int, int]]):
+        if self.window.display is not None:
+            self.commands.extend(zip(repeat(texture.texture), positions))
+
+    def submit(self, commands):
+        self.window.display.blits(commands, doreturn=False)
+
+    def present(self):
+        self.flush()
+
+    def clear(self, color):
+        self.commands.clear()
+        if self.window.display is not None:
+            self.window.display.fill(color)
@@ -0,0 +1,67 @@
+import pygame
+from nodex.abstract.texture import *
+from nodex.cache.transform import transform_cache
+from nodex.wrappers.pygame.texture import transform_surface
+from typing import *
+
+class HeadlessTexture(AbstractTexture):
+    transform_cache = transform_cache
+
+    def __init__(self, path: str, image: Optional[pygame.Surface] = None) -> None:
+        # No display exists, so the surface is kept in its file pixel format
+        self.base_texture = image if image is not None else self.decode(path)
+        self._texture: Optional[pygame.Surface] = self.base_texture
+        self.scaling: Tuple[float, float] = (1.0, 1.0)
+        self.angle: float = 0.0
+        self._zoomed: Optional[AbstractTexture] = None
+
+    @staticmethod
+    def decode(path: str) -> pygame.Surface:
+        return pygame.image.load(path)
+
+    @classmethod
+    def from_surface(cls, surface: pygame.Surface) -> "AbstractTexture":
+        return cls("", surface)
+
+    def scale(self, scaling: Tuple[float, float]) -> None:
+        self.scaling = (scaling[0], scaling[1])
+        self._texture = None
+
+    def rotate(self, angle: float) -> None:
+        self.angle = angle
+        self._texture = None
+
+    def slice(self, rect: Tuple[int, int, int, int]) -> "AbstractTexture":
+        view = self.copy()
+        view.base_texture = self.base_texture.subsurface(rect)
+        view._texture = view.base_texture
+        view.scaling = (1.0, 1.0)
+        view.angle = 0.0
+        view._zoomed = None
+        return view
+
+    def zoomed(self, zoom: float) -> "AbstractTexture":
+        if zoom == 1.0:
+            return self
+        scaling = (self.scaling[0] * zoom, self.scaling[1] * zoom)
+        view = self._zoomed
+        if view is None or view.scaling != scaling or view.angle != self.angle or view.base_texture is not self.base_texture:
+            view = self._zoomed = self.copy()
+            view._zoomed = None
+            view.scale(scaling)
+        return view
+
+    @property
+    def texture(self) -> pygame.Surface:
+        # Made when drawn, so a scale followed by a rotate transforms once
+        if self._texture is None:
+            self._texture = self.transform_cache.get(self.base_texture, self.scaling, self.angle, transform_surface, pygame.Surface.get_size)
+        return self._texture
+
+    @property
+    def size(self):
+        return self.base_texture.get_size()
+
+    @property
+    def bounds(self) -> Tuple[int, int]:
+        return self.texture.get_size()
@@ -0,0 +1,6 @@
+from nodex.abstract.timing import AbstractTiming
+from typing import *
+
+class HeadlessTiming(AbstractTiming):
+    # Headless runs are never throttled, fps is only the target late frames are counted against
+    paced = False
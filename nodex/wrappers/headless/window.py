@@ -0,0 +1,16 @@
+import pygame
+from nodex.abstract.window import AbstractWindow
+from typing import *
+
+class HeadlessWindow(AbstractWindow):
+    def __init__(self, size: Tuple[int, int], rasterize: bool = False):
+        self.size = size
+        self.caption = ""
+        # Only allocate a pixel buffer when the frames are actually needed
+        self.display = pygame.Surface(size) if rasterize else None
+
+    def set_caption(self, caption: str) -> None:
+        self.caption = caption
+
+    def close(self):
+        self.display = None
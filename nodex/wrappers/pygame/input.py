@@ -6,11 +6,16 @@ from nodex._private import *
 from nodex.system_event.system_event import SystemEvent
 
 class PygameInput(AbstractInput):
+    def __init__(self):
+        self._event = SystemEvent(nodex.QUIT)
+
     def events(self):
+        event_out = self._event
         for event in pygame.event.get():
-            if event.type == pygame.KEYDOWN:
-                yield SystemEvent(nodex.KEYDOWN, key = translate_pygame_key(event.key))
-            if event.type == pygame.KEYUP:
-                yield SystemEvent(nodex.KEYUP, key = translate_pygame_key(event.key))
-            if event.type == pygame.QUIT:
-                yield SystemEvent(nodex.QUIT)
\ No newline at end of file
+            type = event.type
+            if type == pygame.KEYDOWN:
+                yield event_out.set(nodex.KEYDOWN, translate_pygame_key(event.key), event.key)
+            elif type == pygame.KEYUP:
+                yield event_out.set(nodex.KEYUP, translate_pygame_key(event.key), event.key)
+            elif type == pygame.QUIT:
+                yield event_out.set(nodex.QUIT)
@@ -6,14 +6,24 @@ from typing import *
 
 class PygameRenderer(AbstractRenderer):
     def __init__(self, window: PygameWindow):
+        super().__init__(window)
         self.window = window
         
     def draw(self, texture: PygameTexture, position : Tuple[int, int]):
-        self.window.display.blit(texture.texture, position)
+        # The surface is resolved now so later scale/rotate calls do not affect this frame
+        self.commands.append((texture.texture, position))
+        
+    def draw_many(self, texture: PygameTexture, positions: Iterable[Tuple[int, int]]):
+        self.commands.extend(zip(repeat(texture.texture), positions))
+        
+    def submit(self, commands):
+        self.window.display.blits(commands, doreturn=False)
         
     def present(self):
+        self.flush()
         pygame.display.flip()
         
     def clear(self, color):
+        self.commands.clear()
         self.window.display.fill(color)
-    
\ No newline at end of file
+    
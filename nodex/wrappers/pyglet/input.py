@@ -1,25 +1,25 @@
+import weakref
+
 import pyglet
 import nodex
 
-from collections import namedtuple
 from nodex.abstract.input import AbstractInput
 from nodex._private import *
 from nodex.system_event.system_event import SystemEvent
 
-Event = namedtuple("Event", ["type", "key"])
-
 class _PygletEventDispatcher(pyglet.event.EventDispatcher):
     def __init__(self):
+        # (type, symbol) of the events dispatched since the last read
         self.events = []
 
     def on_key_press(self, symbol, modifiers):
-        self.events.append(Event(nodex.KEYDOWN, symbol))
+        self.events.append((nodex.KEYDOWN, symbol))
 
     def on_key_release(self, symbol, modifiers):
-        self.events.append(Event(nodex.KEYUP, symbol))
+        self.events.append((nodex.KEYUP, symbol))
 
     def on_close(self):
-        self.events.append(Event(nodex.QUIT, None))
+        self.events.append((nodex.QUIT, None))
 
 _PygletEventDispatcher.register_event_type("on_key_press")
 _PygletEventDispatcher.register_event_type("on_key_release")
@@ -29,20 +29,29 @@ class PygletInput(AbstractInput):
     def __init__(self):
         super().__init__()
         self._handler = _PygletEventDispatcher()
+        self._event = SystemEvent(nodex.QUIT)
+        # Windows the handler was pushed on, pushing it every frame would stack it
+        self._windows = weakref.WeakSet()
 
     def events(self):
-        pyglet.app.platform_event_loop.step()
+        # Polls, a frame never waits for input
+        pyglet.app.platform_event_loop.step(0)
 
+        events = self._handler.events
         for window in pyglet.app.windows:
             window: pyglet.window.Window
+            if window not in self._windows:
+                window.push_handlers(self._handler)
+                self._windows.add(window)
             window.switch_to()
-            window.push_handlers(self._handler)
             window.dispatch_events()
 
-            for event in self._handler.events:
-                if event.type == nodex.KEYDOWN:
-                    yield SystemEvent(nodex.KEYDOWN, key = translate_pyglet_key(event.key))
-                if event.type == nodex.KEYUP:
-                    yield SystemEvent(nodex.KEYUP, key = translate_pyglet_key(event.key))
-                if event.type == nodex.QUIT:
-                    yield SystemEvent(nodex.QUIT)
\ No newline at end of file
+        event = self._event
+        try:
+            for type, symbol in events:
+                if type == nodex.QUIT:
+                    yield event.set(nodex.QUIT)
+                else:
+                    yield event.set(type, translate_pyglet_key(symbol), symbol)
+        finally:
+            events.clear()
@@ -1,3 +1,4 @@
+import pyglet
 from nodex.abstract.renderer import *
 from nodex.wrappers.pyglet.texture import PygletTexture
 from nodex.wrappers.pyglet.window import PygletWindow
@@ -5,16 +6,107 @@ from typing import *
 
 
 class PygletRenderer(AbstractRenderer):
-    def __init__(self, window: PygletWindow):
+    def __init__(self, window: PygletWindow, release_frames: int = 120):
+        """
+        Args:
+            release_frames (int): Frames after which sprites left unused are deleted.
+        """
+        super().__init__(window)
         self.window = window
+        self.batch = pyglet.graphics.Batch()
+        self.release_frames: int = release_frames
+        # Consecutive draws of an image form a run, drawn in its own
+        # ordered group so the batch keeps the submission order
+        self.groups: List[pyglet.graphics.Group] = []
+        # Sprites are kept per run and image and reused from frame to frame.
+        # Scale and rotation are set per sprite, so every handle or view of
+        # an image, copies and zoomed ones included, shares its sprites
+        self.pools: Dict[Tuple[int, pyglet.image.AbstractImage], List[pyglet.sprite.Sprite]] = {}
+        self.in_use: Dict[Tuple[int, pyglet.image.AbstractImage], int] = {}
+        # Pools with sprites left over: (frames since fully used, most sprites used since)
+        self.idle: Dict[Tuple[int, pyglet.image.AbstractImage], Tuple[int, int]] = {}
 
-    def draw(self, texture: PygletTexture, position: Tuple[int, int]):
-        # Invert the y-coordinate for pyglet
-        texture.sprite.update(x=position[0], y=self.window.display.height - texture.texture.height - position[1])
-        texture.sprite.draw()
+    def submit(self, commands):
+        height = self.window.display.height
+        pools = self.pools
+        groups = self.groups
+        in_use = {}
+        run = -1
+        current = None
+        key = pool = None
+        count = 0
+        for texture, position in commands:
+            image = texture.texture
+            if image is not current:
+                if current is not None:
+                    in_use[key] = count
+                run += 1
+                current = image
+                key = (run, image)
+                pool = pools.get(key)
+                if pool is None:
+                    pool = pools[key] = []
+                count = 0
+            if count == len(pool):
+                if run == len(groups):
+                    groups.append(pyglet.graphics.Group(order=run))
+                sprite = pyglet.sprite.Sprite(image, batch=self.batch, group=groups[run])
+                pool.append(sprite)
+            else:
+                sprite = pool[count]
+                if not sprite.visible:
+                    sprite.visible = True
+            count += 1
+            # Invert the y-coordinate for pyglet
+            position = (position[0], height - image.height - position[1], 0)
+            if sprite.position != position:
+                sprite.position = position
+            if sprite.scale_x != texture.scale_x:
+                sprite.scale_x = texture.scale_x
+            if sprite.scale_y != texture.scale_y:
+                sprite.scale_y = texture.scale_y
+            if sprite.rotation != texture.rotation:
+                sprite.rotation = texture.rotation
+        if current is not None:
+            in_use[key] = count
+
+        # Hide the sprites that were drawn last frame but not in this one,
+        # and delete the ones no frame has needed for release_frames
+        last_in_use = self.in_use
+        idle = self.idle
+        released = []
+        for key, pool in pools.items():
+            count = in_use.get(key, 0)
+            if count == len(pool):
+                if key in idle:
+                    del idle[key]
+                continue
+            for sprite in pool[count:last_in_use.get(key, 0)]:
+                sprite.visible = False
+            frames, most = idle.get(key, (0, 0))
+            frames += 1
+            most = max(most, count)
+            if frames >= self.release_frames:
+                released.append((key, most))
+            else:
+                idle[key] = (frames, most)
+        for key, most in released:
+            pool = pools[key]
+            for sprite in pool[most:]:
+                sprite.delete()
+            del pool[most:]
+            if not pool:
+                del pools[key]
+            idle.pop(key, None)
+        self.in_use = in_use
 
     def present(self):
+        # An empty frame is submitted too, so last frame's sprites get hidden
+        self.submit(self.commands)
+        self.commands.clear()
+        self.batch.draw()
         self.window.display.flip()
 
     def clear(self, color):
-        self.window.display.clear()
\ No newline at end of file
+        self.commands.clear()
+        self.window.display.clear()
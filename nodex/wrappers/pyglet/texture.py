@@ -4,17 +4,61 @@ from typing import *
 
 
 class PygletTexture(AbstractTexture):
-    def __init__(self, path: str) -> None:
-        self.texture = pyglet.image.load(path)
-        self.sprite = pyglet.sprite.Sprite(self.texture)
+    def __init__(self, path: str, image: Optional[pyglet.image.AbstractImage] = None) -> None:
+        # The image is decoded in memory, pyglet uploads it when first drawn
+        self.texture = image if image is not None else self.decode(path)
+        # Transforms are applied by the renderer to the pooled sprites
+        self.scale_x: float = 1.0
+        self.scale_y: float = 1.0
+        self.rotation: float = 0.0
+        self._zoomed: Optional[PygletTexture] = None
+
+    @staticmethod
+    def decode(path: str) -> pyglet.image.AbstractImage:
+        return pyglet.image.load(path)
+
+    @classmethod
+    def from_surface(cls, surface: Any) -> "PygletTexture":
+        import pygame
+        width, height = surface.get_size()
+        # A negative pitch tells pyglet the rows go from the top down
+        image = pyglet.image.ImageData(width, height, "RGBA", pygame.image.tobytes(surface, "RGBA"), -width * 4)
+        return cls("", image)
 
     def scale(self, scaling: Tuple[float, float]) -> None:
-        self.sprite.scale_x = scaling[0]
-        self.sprite.scale_y = scaling[1]
+        self.scale_x = scaling[0]
+        self.scale_y = scaling[1]
 
     def rotate(self, angle: float) -> None:
-        self.sprite.rotation = angle
+        self.rotation = angle
+
+    def slice(self, rect: Tuple[int, int, int, int]) -> "PygletTexture":
+        x, y, width, height = rect
+        view = self.copy()
+        # Regions of one uploaded texture share it, so the batch draws
+        # their sprites without switching textures. pyglet counts y upwards
+        view.texture = self.texture.get_texture().get_region(x, self.texture.height - y - height, width, height)
+        view.scale_x = view.scale_y = 1.0
+        view.rotation = 0.0
+        view._zoomed = None
+        return view
+
+    def zoomed(self, zoom: float) -> "PygletTexture":
+        if zoom == 1.0:
+            return self
+        view = self._zoomed
+        if (view is None or view.texture is not self.texture or view.rotation != self.rotation
+                or (view.scale_x, view.scale_y) != (self.scale_x * zoom, self.scale_y * zoom)):
+            view = self._zoomed = self.copy()
+            view._zoomed = None
+            view.scale((self.scale_x * zoom, self.scale_y * zoom))
+        return view
 
     @property
     def size(self):
-        return self.texture.width, self.texture.height
\ No newline at end of file
+        return self.texture.width, self.texture.height
+
+    @property
+    def bounds(self) -> Tuple[int, int]:
+        # Sprites rotate around their anchor, the box stays the scaled one
+        return round(self.texture.width * self.scale_x), round(self.texture.height * self.scale_y)
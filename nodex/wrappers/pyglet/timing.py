@@ -1,15 +1,5 @@
-import pyglet
-
 from nodex.abstract.timing import AbstractTiming
 
 class PygletTiming(AbstractTiming):
-    def __init__(self, fps):
-        self.clock = pyglet.clock.Clock()
-        self.fps = fps
-        
-    def tick(self) -> None:
-        self.clock.tick(self.fps)
-    
-    def get_fps(self) -> int:
-        return int(self.clock.get_frequency())
-    
\ No newline at end of file
+    # pyglet.clock.Clock.tick does not wait, pacing is left to the shared pacer
+    pass
@@ -2,11 +2,48 @@ import sdl2
 import sdl2.ext 
 import nodex
 from nodex.abstract.input import AbstractInput
+from nodex._private import key_name
 from nodex.system_event.system_event import SystemEvent
 
+# SDL key codes to nodex key names, filled as keys are met
+_KEYS = {
+    sdl2.SDLK_LEFT : "LEFT",
+    sdl2.SDLK_RIGHT : "RIGHT",
+    sdl2.SDLK_UP : "UP",
+    sdl2.SDLK_DOWN : "DOWN",
+    sdl2.SDLK_SPACE : "SPACE",
+    sdl2.SDLK_LCTRL : "LCTRL",
+    sdl2.SDLK_RCTRL : "RCTRL",
+    sdl2.SDLK_LSHIFT : "LSHIFT",
+    sdl2.SDLK_RSHIFT : "RSHIFT",
+    sdl2.SDLK_BACKSPACE : "BACKSPACE",
+    sdl2.SDLK_KP_ENTER : "KP_ENTER",
+    sdl2.SDLK_ESCAPE : "ESCAPE",
+}
+
+def translate_sdl_key(key):
+    name = _KEYS.get(key)
+    if name is None:
+        # Letters and digits are named as nodex names them, A and 1
+        name = key_name(sdl2.SDL_GetKeyName(key).decode()) or f"KEY_{key}"
+        _KEYS[key] = name
+    return name
+
 class SDL2Input(AbstractInput):
+    def __init__(self):
+        self._event = SystemEvent(nodex.QUIT)
+
     def events(self):
-        events = sdl2.ext.get_events()
-        for event in events:
-            if event.type == sdl2.SDL_QUIT:
-                yield SystemEvent(nodex.QUIT)
\ No newline at end of file
+        event_out = self._event
+        for event in sdl2.ext.get_events():
+            type = event.type
+            if type == sdl2.SDL_KEYDOWN:
+                # Repeated key downs are left out, as the other backends do
+                if not event.key.repeat:
+                    code = event.key.keysym.sym
+                    yield event_out.set(nodex.KEYDOWN, translate_sdl_key(code), code)
+            elif type == sdl2.SDL_KEYUP:
+                code = event.key.keysym.sym
+                yield event_out.set(nodex.KEYUP, translate_sdl_key(code), code)
+            elif type == sdl2.SDL_QUIT:
+                yield event_out.set(nodex.QUIT)
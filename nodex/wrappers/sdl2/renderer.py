@@ -2,6 +2,7 @@ from nodex.abstract.renderer import AbstractRenderer
 from nodex.abstract.window import AbstractWindow
 from nodex.wrappers.sdl2.texture import SDLTexture
 from typing import *
+from itertools import repeat
 import sdl2
 import sdl2.ext
 
@@ -10,15 +11,42 @@ class SDLRenderer(AbstractRenderer):
         super().__init__(target)
         self.renderer = sdl2.ext.Renderer(target.window)
         self.factory = sdl2.ext.SpriteFactory(renderer=self.renderer)
+        self._dstrect = sdl2.SDL_Rect()
+
+    def _sprite(self, texture: SDLTexture):
+        # Copies and slices of a texture all draw its GPU texture
+        source = texture.source
+        if source.texture is None:
+            source.texture = self.factory.from_surface(source.surface)
+        return source.texture
 
     def draw(self, texture: SDLTexture, position: Tuple[int, int]):
-        if texture.texture is None:
-            texture.texture = self.factory.from_surface(texture.surface)
-        texture.texture.position = position
-        self.renderer.copy(texture.texture)
+        self.commands.append((self._sprite(texture), position, texture.size, texture.angle, texture.srcrect))
+
+    def draw_many(self, texture: SDLTexture, positions: Iterable[Tuple[int, int]]):
+        self.commands.extend(zip(repeat(self._sprite(texture)), positions, repeat(texture.size), repeat(texture.angle), repeat(texture.srcrect)))
+
+    def submit(self, commands):
+        # Calling SDL_RenderCopy directly with one reused rect avoids the
+        # per-call argument handling of sdl2.ext.Renderer.copy
+        render_copy = sdl2.SDL_RenderCopy
+        render_copy_ex = sdl2.SDL_RenderCopyEx
+        sdlrenderer = self.renderer.sdlrenderer
+        dstrect = self._dstrect
+        for sprite, position, size, angle, srcrect in commands:
+            dstrect.x = int(position[0])
+            dstrect.y = int(position[1])
+            dstrect.w, dstrect.h = size
+            if angle:
+                # SDL turns clockwise, around the centre of the destination
+                render_copy_ex(sdlrenderer, sprite.texture, srcrect, dstrect, -angle, None, sdl2.SDL_FLIP_NONE)
+            else:
+                render_copy(sdlrenderer, sprite.texture, srcrect, dstrect)
 
     def present(self):
+        self.flush()
         self.renderer.present()
 
     def clear(self, color: Tuple[int, int]):
-        self.renderer.clear(sdl2.ext.Color(*color))
\ No newline at end of file
+        self.commands.clear()
+        self.renderer.clear(sdl2.ext.Color(*color))
@@ -4,22 +4,78 @@ import sdl2
 import sdl2.ext
 
 class SDLTexture(AbstractTexture):
-    def __init__(self, path: str):
+    def __init__(self, path: str, image: Optional[sdl2.SDL_Surface] = None):
         self.path = path
-        self.surface = sdl2.ext.load_image(path)
+        # The GPU texture is created by the renderer when first drawn
+        self.surface = image if image is not None else self.decode(path)
         self.texture = None  
-        self.width = self.surface.w
-        self.height = self.surface.h
+        # Texture owning the surface and GPU texture, and the part of it
+        # drawn, for views made by slice
+        self.source: SDLTexture = self
+        self.srcrect: Optional[sdl2.SDL_Rect] = None
+        self.base_width = self.surface.w
+        self.base_height = self.surface.h
+        self.width = self.base_width
+        self.height = self.base_height
+        self.angle: float = 0.0
+        self._zoomed: Optional[SDLTexture] = None
+
+    @staticmethod
+    def decode(path: str) -> sdl2.SDL_Surface:
+        return sdl2.ext.load_image(path)
+
+    @classmethod
+    def from_surface(cls, surface: Any) -> "SDLTexture":
+        import pygame
+        width, height = surface.get_size()
+        pixels = pygame.image.tobytes(surface, "RGBA")
+        # The surface made over the pixels doesn't own them, it is copied
+        # into one that does before they are released
+        view = sdl2.SDL_CreateRGBSurfaceWithFormatFrom(pixels, width, height, 32, width * 4, sdl2.SDL_PIXELFORMAT_RGBA32)
+        if not view:
+            return super().from_surface(surface)
+        image = sdl2.SDL_ConvertSurfaceFormat(view, sdl2.SDL_PIXELFORMAT_RGBA32, 0)
+        sdl2.SDL_FreeSurface(view)
+        if not image:
+            return super().from_surface(surface)
+        return cls("", image.contents)
 
     def scale(self, scaling: Tuple[float, float]):
-        self.width = int(self.width * scaling[0])
-        self.height = int(self.height * scaling[1])
-        self.surface = sdl2.ext.scale_surface(self.surface, (self.width, self.height))
+        # The renderer stretches the untouched texture to this size, so
+        # scaling never compounds and the surface never needs rebuilding
+        self.width = max(round(self.base_width * scaling[0]), 1)
+        self.height = max(round(self.base_height * scaling[1]), 1)
         
     def rotate(self, angle: float):
-        # PySDL2 ne fournit pas directement la rotation
-        raise NotImplementedError("Rotation is not implemented with SDL2 in this wrapper.")
+        # Counterclockwise like the other backends, applied by SDL_RenderCopyEx
+        self.angle = angle
     
+    def slice(self, rect: Tuple[int, int, int, int]) -> "SDLTexture":
+        x, y, width, height = rect
+        if self.srcrect is not None:
+            x += self.srcrect.x
+            y += self.srcrect.y
+        view = self.copy()
+        view.srcrect = sdl2.SDL_Rect(x, y, width, height)
+        view.base_width = view.width = width
+        view.base_height = view.height = height
+        view.angle = 0.0
+        view._zoomed = None
+        return view
+
+    def zoomed(self, zoom: float) -> "SDLTexture":
+        if zoom == 1.0:
+            return self
+        width = max(round(self.width * zoom), 1)
+        height = max(round(self.height * zoom), 1)
+        view = self._zoomed
+        if view is None or (view.width, view.height, view.angle, view.srcrect) != (width, height, self.angle, self.srcrect):
+            view = self._zoomed = self.copy()
+            view._zoomed = None
+            view.width = width
+            view.height = height
+        return view
+
     @property
     def size(self):
-        return (self.width, self.height)
\ No newline at end of file
+        return (self.width, self.height)
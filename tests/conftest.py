@@ -0,0 +1,27 @@
+import os
+
+# Tests run without a display
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pyglet
+
+pyglet.options["shadow_window"] = False
+if not os.environ.get("DISPLAY") and not os.environ.get("WAYLAND_DISPLAY"):
+    pyglet.options["headless"] = True
+
+import pytest
+
+import nodex
+
+@pytest.fixture
+def context():
+    return nodex.Context((64, 64), backend="headless")
+
+@pytest.fixture
+def pyglet_context():
+    try:
+        context = nodex.Context((64, 64), backend="pyglet")
+    except Exception as error:
+        pytest.skip(f"pyglet can't open a window: {error}")
+    yield context
+    context.window.close()
@@ -0,0 +1,47 @@
+import os
+
+import pytest
+
+from nodex.abstract.texture import AbstractTexture
+from nodex.atlas.atlas import Atlas, pack
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BALL = os.path.join(ROOT, "ball.png")
+BIRD = os.path.join(ROOT, "bird.png")
+
+def test_pack_keeps_rects_apart():
+    sizes = [(30, 20), (10, 40), (25, 25), (5, 5)] * 4
+    positions, pages = pack(sizes, page_size=64, padding=1)
+    boxes = [(page, x, y, x + width + 1, y + height + 1) for (page, x, y), (width, height) in zip(positions, sizes)]
+    for index, (page, x0, y0, x1, y1) in enumerate(boxes):
+        assert x1 <= 64 and y1 <= 64
+        for other, ox0, oy0, ox1, oy1 in boxes[index + 1:]:
+            assert page != other or x1 <= ox0 or ox1 <= x0 or y1 <= oy0 or oy1 <= y0
+
+def test_atlas_without_cache_dir_stays_out_of_the_cache(context):
+    atlas = Atlas.build(context, {"ball": BALL, "bird": BIRD})
+    assert len(context.texture_cache) == 0
+    ball = context.load_texture(BALL)
+    assert atlas["ball"].size == ball.size
+    page, x, y, width, height = atlas.rects["ball"]
+    assert atlas["ball"].base_texture.get_at((width // 2, height // 2)) == ball.base_texture.get_at((width // 2, height // 2))
+
+def test_atlas_cache_dir_is_reused(context, tmp_path):
+    first = Atlas.build(context, [BALL, BIRD], cache_dir=str(tmp_path))
+    second = Atlas.build(context, [BALL, BIRD], cache_dir=str(tmp_path))
+    assert first.rects == second.rects
+    assert second.pages[0] is first.pages[0]
+
+def test_textures_must_slice_and_zoom():
+    class Incomplete(AbstractTexture):
+        def __init__(self, path, image=None):
+            pass
+
+        def scale(self, scaling):
+            pass
+
+        def rotate(self, angle):
+            pass
+
+    with pytest.raises(TypeError):
+        Incomplete("")
@@ -0,0 +1,41 @@
+import os
+
+BALL = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ball.png")
+
+def test_size_is_the_base_size(context):
+    texture = context.load_texture(BALL, shared=False)
+    width, height = texture.size
+    texture.scale((2, 2))
+    assert texture.size == (width, height)
+    assert texture.bounds == (width * 2, height * 2)
+
+def test_draw_stats_with_the_default_camera(context):
+    texture = context.load_texture(BALL)
+
+    def frame():
+        context.draw(texture, (0, 0))
+        context.draw_many(texture, ((x, 0) for x in range(3)))
+    context.step(frame)
+    context.step(frame)
+    assert context.draw_stats == (4, 4)
+    assert context.draw_stats.culled == 0
+
+def test_draw_stats_count_culled_draws(context):
+    texture = context.load_texture(BALL)
+    context.camera.position = (1000, 1000)
+
+    def frame():
+        context.draw(texture, (1010, 1010))
+        context.draw(texture, (0, 0))
+        context.draw_many(texture, [(0, 0), (1020, 1020)])
+    context.step(frame)
+    context.step(frame)
+    assert context.draw_stats == (4, 2)
+    assert context.draw_stats.culled == 2
+
+def test_camera_converts_coordinates(context):
+    camera = context.camera
+    camera.position = (100, 50)
+    camera.zoom = 2.0
+    assert camera.world_to_screen((110, 60)) == (20, 20)
+    assert camera.screen_to_world((20, 20)) == (110, 60)
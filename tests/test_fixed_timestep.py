@@ -0,0 +1,14 @@
+import nodex
+
+def test_dropped_ticks_leave_only_a_partial_tick():
+    context = nodex.Context((64, 64), backend="headless", tick_rate=10, max_ticks=5)
+    assert context.advance(1.25) == 5
+    assert context.dropped_ticks == 7
+    assert abs(context.alpha - 0.5) < 1e-9
+    assert context.advance(0.01) == 0
+    assert context.advance(0.05) == 1
+
+def test_ticks_follow_elapsed_time():
+    context = nodex.Context((64, 64), backend="headless", tick_rate=4)
+    assert [context.advance(0.125) for _ in range(4)] == [0, 1, 0, 1]
+    assert context.tick_count == 2
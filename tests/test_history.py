@@ -0,0 +1,96 @@
+import random
+
+from nodex import Node
+
+class Seed(Node):
+    def __init__(self, context, label="Seed", weight=2):
+        super().__init__(context, label)
+        self.weight = weight
+
+def shape(node):
+    return (node.id, node.label, node.order, sorted(node.tags), dict(node._content or {}),
+            [shape(child) for child in sorted(node.children, key=lambda child: -child.order)])
+
+def chain(context, *labels):
+    nodes = [Node(context, label) for label in labels]
+    for parent, child in zip(nodes, nodes[1:]):
+        parent.link(child)
+    return nodes
+
+def test_restore_keeps_linked_subtree(context):
+    root = Node(context, "root")
+    history = root.track()
+    a, b = chain(context, "a", "b")
+    root.link(a)
+    frame = history.checkpoint()
+    a.unlink()
+    history.checkpoint()
+    history.restore(frame)
+    assert [child.label for child in root.children] == ["a"]
+    assert [child.label for child in root.children[0].children] == ["b"]
+
+def test_restore_deep_subtree_linked_removed_and_relinked(context):
+    root = Node(context, "root")
+    other = Node(context, "other")
+    root.link(other)
+    history = root.track()
+    a, b, c, d = chain(context, "a", "b", "c", "d")
+    b.link(Node(context, "e"))
+    root.link(a)
+    linked = history.checkpoint()
+    expected = shape(root)
+    a.unlink()
+    removed = history.checkpoint()
+    other.link(a)
+    history.checkpoint()
+    history.restore(removed)
+    assert [child.label for child in root.children] == ["other"]
+    assert root.children[0].children == []
+    other.link(a)
+    history.checkpoint()
+    history.restore(linked)
+    assert shape(root) == expected
+
+def test_restore_recreates_subclass_with_constructor(context):
+    root = Node(context, "root")
+    root.link(Seed(context))
+    history = root.track()
+    frame = history.checkpoint()
+    root.children[0].unlink()
+    history.checkpoint()
+    history.restore(frame)
+    seed = root.children[0]
+    assert isinstance(seed, Seed)
+    assert seed.weight == 2
+
+def test_restore_random_edits(context):
+    rng = random.Random(4)
+    root = Node(context, "root")
+    history = root.track(capacity=50)
+    free = []
+    shapes = {history.frame: shape(root)}
+    for _ in range(40):
+        tree = root.get_descendants()
+        for _ in range(rng.randint(1, 4)):
+            action = rng.random()
+            if action < 0.4 or not tree:
+                subtree = chain(context, *[f"n{rng.randint(0, 9)}" for _ in range(rng.randint(1, 3))])
+                subtree[0].order = rng.randint(0, 3)
+                (rng.choice(tree) if tree else root).link(subtree[0])
+            elif action < 0.6:
+                node = rng.choice(tree)
+                node.unlink()
+                free.append(node)
+            elif action < 0.75 and free:
+                node = free.pop(rng.randrange(len(free)))
+                if node._index_root is None and node.parent is None:
+                    (rng.choice(tree) if tree else root).link(node)
+            elif action < 0.9:
+                rng.choice(tree).order = rng.randint(0, 3)
+            else:
+                rng.choice(tree).content["value"] = rng.randint(0, 9)
+            tree = root.get_descendants()
+        shapes[history.checkpoint()] = shape(root)
+    for frame in sorted(shapes, reverse=True)[::7]:
+        history.restore(frame)
+        assert shape(root) == shapes[frame]
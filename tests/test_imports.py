@@ -0,0 +1,7 @@
+import subprocess
+import sys
+
+def test_context_imports_no_backend():
+    code = "import sys, nodex.context.context; print(sorted({'pygame', 'pyglet', 'sdl2'} & set(sys.modules)))"
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert output.splitlines()[-1] == "[]"
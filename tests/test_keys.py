@@ -0,0 +1,34 @@
+import pygame
+import pytest
+
+from nodex._private import key_name, translate_pygame_key, translate_pyglet_key
+from nodex.system_event.system_event import SystemEvent
+from pyglet.window import key as pyglet_key
+
+@pytest.mark.parametrize("pygame_name, sdl_name, pyglet_name, name", [
+    ("left alt", "Left Alt", "LALT", "LALT"),
+    ("right meta", "Right GUI", "RWINDOWS", "RMETA"),
+    ("return", "Return", "ENTER", "RETURN"),
+    ("caps lock", "CapsLock", "CAPSLOCK", "CAPSLOCK"),
+    ("page up", "PageUp", "PAGEUP", "PAGEUP"),
+    ("[1]", "Keypad 1", "NUM_1", "KP_1"),
+    ("[+]", "Keypad +", "NUM_ADD", "KP_ADD"),
+    ("-", "-", "MINUS", "MINUS"),
+    ("[", "[", "BRACKETLEFT", "BRACKETLEFT"),
+    ("f1", "F1", "F1", "F1"),
+])
+def test_backend_names_agree(pygame_name, sdl_name, pyglet_name, name):
+    assert key_name(pygame_name) == name
+    assert key_name(sdl_name) == name
+    assert key_name(pyglet_name) == name
+
+def test_translated_keys_agree():
+    assert translate_pygame_key(pygame.K_LALT) == translate_pyglet_key(pyglet_key.LALT) == "LALT"
+    assert translate_pygame_key(pygame.K_KP1) == translate_pyglet_key(pyglet_key.NUM_1) == "KP_1"
+    assert translate_pygame_key(pygame.K_a) == translate_pyglet_key(pyglet_key.A) == "A"
+
+def test_system_event_keeps_custom_attributes():
+    event = SystemEvent("SCORE", points=3)
+    assert event.type == "SCORE"
+    assert event.points == 3
+    assert event.key is None
@@ -0,0 +1,56 @@
+import pytest
+
+from nodex import Node
+from nodex.profiler.profiler import Profiler
+
+def test_children_assignment_links_and_unlinks(context):
+    root = Node(context, "root")
+    old = Node(context, "old")
+    root.link(old)
+    assert root.search(old.id) is old
+    first = Node(context, "first")
+    second = Node(context, "second")
+    second.order = 2
+    root.children = [first, second]
+    assert old.parent is None
+    assert first.parent is root and second.parent is root
+    assert root.search(old.id) is None
+    assert root.search(second.id) is second
+    assert root.get_descendants({"@first"}) == [first]
+    assert [node.label for node in root.get_descendants()] == ["second", "first"]
+
+def test_children_assignment_moves_from_other_parent(context):
+    root = Node(context, "root")
+    other = Node(context, "other")
+    child = Node(context, "child")
+    other.link(child)
+    root.children = [child]
+    assert child.parent is root
+    assert other.children == []
+
+def test_children_assignment_rejects_duplicates(context):
+    root = Node(context, "root")
+    child = Node(context, "child")
+    with pytest.raises(ValueError):
+        root.children = [child, child]
+
+def test_update_all_without_context():
+    updated = []
+
+    class Counter(Node):
+        def update(self):
+            updated.append(self.label)
+
+    root = Counter(None, "root")
+    root.link(Counter(None, "child"))
+    root.update_all()
+    assert updated == ["root", "child"]
+
+def test_update_all_profiled(context):
+    root = Node(context, "root")
+    root.link(Node(context, "child"))
+    context.profiler = profiler = Profiler()
+    profiler.begin_frame()
+    root.update_all()
+    profiler.end_frame()
+    assert profiler.frames[-1].nodes["Node"][1] == 2
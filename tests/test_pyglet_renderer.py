@@ -0,0 +1,39 @@
+import os
+
+BALL = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ball.png")
+
+def sprites(renderer):
+    return sum(len(pool) for pool in renderer.pools.values())
+
+def test_handles_of_an_image_share_its_sprites(pyglet_context):
+    context = pyglet_context
+    texture = context.load_texture(BALL)
+    copy = texture.copy()
+    copy.scale((2, 2))
+
+    def frame():
+        context.draw(texture, (0, 0))
+        context.draw(copy, (10, 0))
+        context.draw(texture.zoomed(3.0), (20, 0))
+    context.step(frame, dt=1)
+    renderer = context.renderer
+    assert len(renderer.groups) == 1
+    assert sprites(renderer) == 3
+    scales = sorted(sprite.scale_x for pool in renderer.pools.values() for sprite in pool)
+    assert scales == [1.0, 2.0, 3.0]
+
+def test_zooming_reuses_sprites(pyglet_context, monkeypatch):
+    import pyglet
+    context = pyglet_context
+    texture = context.load_texture(BALL)
+    created = []
+    sprite_type = pyglet.sprite.Sprite
+    monkeypatch.setattr(pyglet.sprite, "Sprite", lambda *args, **kwargs: created.append(1) or sprite_type(*args, **kwargs))
+
+    def frame():
+        context.draw_many(texture, [(x, 0) for x in range(0, 20, 4)])
+    for index in range(20):
+        context.camera.zoom = 1.0 + index / 10
+        context.step(frame, dt=1)
+    assert len(created) == 5
+    assert sprites(context.renderer) == 5
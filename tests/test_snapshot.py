@@ -0,0 +1,67 @@
+import io
+
+import pytest
+
+from nodex import Node
+from nodex.node import snapshot
+
+class Bird(Node):
+    def __init__(self, context, speed=3):
+        super().__init__(context, "Bird")
+        self.speed = speed
+
+class Wing:
+    def __init__(self, span):
+        self.span = span
+
+class Nest(Node):
+    def __init__(self, context, eggs):
+        super().__init__(context, "Nest")
+        self.eggs = eggs
+
+def saved(root):
+    stream = io.BytesIO()
+    snapshot.save(root, stream)
+    stream.seek(0)
+    return stream
+
+def test_round_trip(context):
+    root = Node(context, "root")
+    first = Node(context, "first")
+    second = Node(context, "second")
+    second.order = 5
+    root.link(first)
+    root.link(second)
+    first.link(Node(context, "leaf"))
+    first.tags.add("extra")
+    first.content["hp"] = [1, 2]
+
+    loaded = snapshot.load(context, saved(root))
+    assert [child.label for child in loaded.children] == ["second", "first"]
+    copy = loaded.children[1]
+    assert copy.id == first.id
+    assert copy.tags == {"@first", "extra"}
+    assert copy.content == {"hp": [1, 2]}
+    assert copy.children[0].label == "leaf"
+
+def test_subclass_constructor_runs(context):
+    root = Node(context, "root")
+    root.link(Bird(context))
+    bird = snapshot.load(context, saved(root)).children[0]
+    assert isinstance(bird, Bird)
+    assert bird.speed == 3
+    assert bird.context is context
+
+def test_subclass_without_usable_constructor_fails(context):
+    root = Node(context, "root")
+    root.link(Nest(context, 2))
+    with pytest.raises(TypeError, match="new_root"):
+        snapshot.load(context, saved(root))
+
+def test_only_allowed_classes_load(context):
+    root = Node(context, "root")
+    root.content["wing"] = Wing(4)
+    with pytest.raises(snapshot.SnapshotError):
+        snapshot.load(context, saved(root))
+    loaded = snapshot.load(context, saved(root), allowed=[Wing])
+    assert loaded.content["wing"].span == 4
@@ -0,0 +1,42 @@
+import os
+
+from nodex.wrappers.headless.texture import HeadlessTexture
+
+BALL = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ball.png")
+
+def counted_decode(monkeypatch):
+    calls = []
+    decode = HeadlessTexture.decode
+
+    def counting(path):
+        calls.append(path)
+        return decode(path)
+    monkeypatch.setattr(HeadlessTexture, "decode", staticmethod(counting))
+    return calls
+
+def test_repeated_loads_decode_once(context, monkeypatch):
+    calls = counted_decode(monkeypatch)
+    first = context.load_texture(BALL)
+    for _ in range(5):
+        assert context.load_texture(BALL) is first
+    assert len(calls) == 1
+    assert context.texture_cache.misses == 1
+    assert context.texture_cache.hits == 5
+
+def test_private_copy_shares_the_decoded_image(context, monkeypatch):
+    calls = counted_decode(monkeypatch)
+    shared = context.load_texture(BALL)
+    private = context.load_texture(BALL, shared=False)
+    assert private is not shared
+    assert private.base_texture is shared.base_texture
+    private.scale((2, 2))
+    assert shared.scaling == (1.0, 1.0)
+    assert len(calls) == 1
+
+def test_evicted_texture_in_use_is_not_decoded_again(context, monkeypatch):
+    calls = counted_decode(monkeypatch)
+    held = context.load_texture(BALL)
+    context.texture_cache.resize(0)
+    context.load_texture(os.path.join(os.path.dirname(BALL), "bird.png"))
+    assert context.load_texture(BALL) is held
+    assert len(calls) == 2